@@ -0,0 +1,121 @@
+"""Check ``clean_html`` against the BeautifulSoup implementation and time both.
+
+Run from the repository root:
+
+    python -m benchmarks.clean_html [--fuzz 20000] [--repeat 300]
+
+Exits with status 1 if any sample produces a different output.
+"""
+
+import argparse
+import random
+import re
+import sys
+import warnings
+from time import perf_counter
+
+from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning
+
+from src.webcrawler.utils import clean_html
+
+warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
+
+
+def reference_clean_html(value: str | None) -> str | None:
+    """``clean_html`` as it was implemented on top of BeautifulSoup."""
+    if not value:
+        return None
+
+    text = BeautifulSoup(value, "html.parser").get_text("\n", strip=True)
+    text = re.sub(r"\r", "", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    normalized = text.strip()
+    return normalized or None
+
+
+_PARAGRAPH = (
+    "<p>Nous recherchons un(e) <strong>Data Scientist</strong> pour rejoindre "
+    "l&#39;équipe &amp; industrialiser nos modèles.</p>"
+)
+_BULLETS = "<ul>" + "".join(
+    f"<li>{years} ans d&rsquo;expérience avec Python, SQL &amp; Spark</li>"
+    for years in range(1, 9)
+) + "</ul>"
+DESCRIPTION = (
+    "<h2>Profil recherché</h2>" + _PARAGRAPH * 3 + _BULLETS + "<br><p>&nbsp;</p>"
+) * 4
+
+GOLDEN_SAMPLES = (
+    "",
+    "plain text\r\n  with spaces  ",
+    DESCRIPTION,
+    "<p>a</p><script>var x = '<p>y</p>';</script><style>p {}</style>b",
+    "<template><p>hidden</p><![CDATA[ kept ]]></template>shown",
+    "<ruby>漢<rp>(</rp><rt>kan</rt><rp>)</rp></ruby>",
+    "a &amp; b &nbsp;c&foo; &#8217; &#150; &unknown &lt &copy2 &#x27; &#12ab",
+    "a<b>b</b>c <br>d\r\ne\n\n\n\nf<br></br>g",
+    "<p>x < y</p> 5 > 3 <a href='x'>lien</a><!-- comment --><!DOCTYPE html>",
+    "<p>a</p  ><p/>b<",
+)
+
+_FUZZ_PIECES = (
+    "<p>", "</p>", "<b>", "</b>", "<br>", "<br/>", "</br>", "<ul>", "<li>",
+    "</li>", "</ul>", "<div class='x'>", "</div>", "<script>", "</script>",
+    "<script>var a='<p>x</p>';</script>", "<style>p{}</style>", "<template>",
+    "</template>", "<template/>", "<rt>", "</rt>", "<rp>", "<!-- c -->",
+    "<!-->", "<![CDATA[ cd ]]>", "<!DOCTYPE html>", "<?xml v?>", "<!", "</",
+    "&amp;", "&nbsp;", "&foo;", "&#8217;", "&#150;", "&#x27;", "&#99999999;",
+    "&lt", "&copy2", "&#12ab", "&#xzz;", "&", "#", "\n", "\n\n\n", "\r\n", " ",
+    "\xa0", "text", "Profil recherché :", "<strong>Python</strong>", "<", "> ",
+    '<a href="u">lien</a>', "<img src=x>", "<textarea>", "</textarea>",
+)
+
+
+def fuzz_samples(count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choice(_FUZZ_PIECES) for _ in range(rng.randint(1, 30)))
+        for _ in range(count)
+    ]
+
+
+def check(samples: list[str]) -> int:
+    mismatches = 0
+    for sample in samples:
+        expected, actual = reference_clean_html(sample), clean_html(sample)
+        if expected != actual:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"MISMATCH {sample!r}\n  expected {expected!r}\n  actual   {actual!r}")
+    return mismatches
+
+
+def timeit(func, value: str, repeat: int) -> float:
+    start = perf_counter()
+    for _ in range(repeat):
+        func(value)
+    return (perf_counter() - start) / repeat
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fuzz", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=300)
+    args = parser.parse_args()
+
+    samples = list(GOLDEN_SAMPLES) + fuzz_samples(args.fuzz)
+    mismatches = check(samples)
+    print(f"equivalence: {len(samples) - mismatches}/{len(samples)} samples identical")
+
+    before = timeit(reference_clean_html, DESCRIPTION, args.repeat)
+    after = timeit(clean_html, DESCRIPTION, args.repeat)
+    print(
+        f"clean_html on {len(DESCRIPTION)} chars: "
+        f"BeautifulSoup {before * 1e3:.3f} ms, current {after * 1e3:.3f} ms "
+        f"({before / after:.1f}x)"
+    )
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
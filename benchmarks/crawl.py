@@ -0,0 +1,116 @@
+"""End-to-end crawl benchmark against the local fake job board.
+
+Starts ``benchmarks.fake_board`` on a free port, points the crawlers at it and
+runs the Indeed, WTTJ and LinkedIn crawls, reporting pages/sec and the number
+of items each returned. Needs no network access.
+
+Run from the repository root:
+
+    python -m benchmarks.crawl [--platform indeed wttj linkedin] [--jobs 60]
+        [--latency-ms 20] [--error-rate 0.05] [--block-rate 0.05]
+
+The WTTJ crawl uses the JSON API backend unless ``--wttj-backend browser`` is
+given, which needs Chromium. Exits with status 1 if a crawl returned no items.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+from collections import Counter
+from time import perf_counter
+from typing import Any, Awaitable, Callable
+
+from benchmarks.fake_board import BoardConfig, FakeBoard
+
+PLATFORMS = ("indeed", "wttj", "linkedin")
+
+
+async def run(args: argparse.Namespace, board: FakeBoard) -> int:
+    # The crawler modules read the site URLs when imported.
+    from src.webcrawler.orchestrator import CrawlOrchestrator
+    from src.webcrawler.ratelimit import DomainPolicy, RateController
+    from src.webcrawler.service import (
+        crawl_indeed_jobs,
+        crawl_linkedin_jobs,
+        crawl_wttj_jobs,
+    )
+
+    host = board.url.split("//", 1)[1].split(":", 1)[0]
+    controller = RateController(
+        {host: DomainPolicy(rate=args.rate, max_rate=args.rate, burst=int(args.rate))}
+    )
+    crawls: dict[str, Callable[[Any], Awaitable[list[dict[str, Any]]]]] = {
+        "indeed": lambda o: crawl_indeed_jobs(
+            "data", "France", count=args.jobs, orchestrator=o
+        ),
+        "wttj": lambda o: crawl_wttj_jobs(
+            "data", count=args.jobs, orchestrator=o, backend=args.wttj_backend
+        ),
+        "linkedin": lambda o: crawl_linkedin_jobs(
+            "data", "France", count=args.jobs, orchestrator=o
+        ),
+    }
+
+    failures = 0
+    budgets = {platform: args.concurrency for platform in PLATFORMS}
+    async with CrawlOrchestrator(budgets=budgets, rate_controller=controller) as orchestrator:
+        for platform in args.platform:
+            before = Counter(board.stats)
+            start = perf_counter()
+            items = await crawls[platform](orchestrator)
+            elapsed = perf_counter() - start
+            served = Counter(board.stats)
+            served.subtract(before)
+            pages = sum(n for key, n in served.items() if key.startswith(f"{platform}."))
+            faults = {
+                key.split(".", 1)[1]: n
+                for key, n in served.items()
+                if key in (f"{platform}.error", f"{platform}.blocked") and n
+            }
+            print(
+                f"{platform:<9} {len(items):4d} items  {pages:4d} pages  "
+                f"{elapsed:6.2f} s  {pages / elapsed:7.1f} pages/sec"
+                + (f"  injected {faults}" if faults else "")
+            )
+            failures += not items
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--platform", nargs="+", choices=PLATFORMS, default=list(PLATFORMS))
+    parser.add_argument("--jobs", type=int, default=60, help="postings per platform")
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--block-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--rate", type=float, default=200.0, help="requests/sec allowed to the board"
+    )
+    parser.add_argument("--wttj-backend", choices=("api", "browser"), default="api")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    config = BoardConfig(
+        jobs=args.jobs,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        block_rate=args.block_rate,
+    )
+    with FakeBoard(config) as board, tempfile.TemporaryDirectory() as storage_dir:
+        os.environ.update(board.environ())
+        # Keep the crawl datasets out of the working tree.
+        os.environ["CRAWLEE_STORAGE_DIR"] = storage_dir
+        if not args.verbose:
+            os.environ.setdefault("CRAWLEE_LOG_LEVEL", "WARNING")
+        return 1 if asyncio.run(run(args, board)) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
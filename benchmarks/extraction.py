@@ -0,0 +1,155 @@
+"""Benchmark and regression check for the job text extraction pipeline.
+
+Runs the checked-in, anonymized descriptions in ``benchmarks/corpus/jobs.jsonl``
+through ``clean_html``, ``extract_requirements_snippet``, ``normalize_date``
+and the experience/education classifiers, reports jobs/sec and the time spent
+in each stage, and compares every output with ``benchmarks/corpus/expected.json``.
+
+Run from the repository root:
+
+    python -m benchmarks.extraction [--repeat 200] [--update]
+
+Exits with status 1 if any output differs from the expected one. Use
+``--update`` only when an output change is intended.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable
+
+from src.webcrawler.utils import (
+    clean_html,
+    extract_education_level,
+    extract_experience_level,
+    extract_requirements_snippet,
+    normalize_date,
+    normalize_education_level,
+    normalize_experience_level,
+)
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+JOBS_FILE = CORPUS_DIR / "jobs.jsonl"
+EXPECTED_FILE = CORPUS_DIR / "expected.json"
+
+
+def load_jobs() -> list[dict[str, Any]]:
+    with JOBS_FILE.open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def description_text(job: dict[str, Any]) -> str | None:
+    if "description_text" in job:
+        return job["description_text"]
+    return clean_html(job.get("description_html"))
+
+
+def experience_level(job: dict[str, Any], text: str | None) -> str | None:
+    structured = job.get("experience_level") or job.get("seniority_level")
+    return normalize_experience_level(structured) or extract_experience_level(text)
+
+
+def education_level(job: dict[str, Any], text: str | None) -> str | None:
+    return normalize_education_level(job.get("education_level")) or (
+        extract_education_level(text)
+    )
+
+
+def extract(job: dict[str, Any]) -> dict[str, Any]:
+    text = description_text(job)
+    return {
+        "job_desc": text,
+        "job_profile": clean_html(job.get("profile_html")),
+        "job_reqs": extract_requirements_snippet(text),
+        "published_at": normalize_date(job.get("published_at")),
+        "exp_level": experience_level(job, text),
+        "edu_level": education_level(job, text),
+    }
+
+
+def stages(jobs: list[dict[str, Any]]) -> dict[str, Callable[[], None]]:
+    """One callable per stage, each running that stage over the whole corpus."""
+    html_inputs = [
+        value
+        for job in jobs
+        for value in (job.get("description_html"), job.get("profile_html"))
+        if value
+    ]
+    texts = [description_text(job) for job in jobs]
+    dates = [job.get("published_at") for job in jobs]
+    return {
+        "clean_html": lambda: [clean_html(value) for value in html_inputs],
+        "extract_requirements_snippet": lambda: [
+            extract_requirements_snippet(text) for text in texts
+        ],
+        "normalize_date": lambda: [normalize_date(value) for value in dates],
+        "experience_level": lambda: [
+            experience_level(job, text) for job, text in zip(jobs, texts)
+        ],
+        "education_level": lambda: [
+            education_level(job, text) for job, text in zip(jobs, texts)
+        ],
+    }
+
+
+def check(jobs: list[dict[str, Any]], update: bool) -> int:
+    actual = {job["id"]: extract(job) for job in jobs}
+    if update:
+        EXPECTED_FILE.write_text(
+            json.dumps(actual, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+        )
+        print(f"wrote {EXPECTED_FILE}")
+        return 0
+
+    expected = json.loads(EXPECTED_FILE.read_text(encoding="utf-8"))
+    mismatches = 0
+    for job_id in sorted(expected.keys() | actual.keys()):
+        want, got = expected.get(job_id), actual.get(job_id)
+        if want == got:
+            continue
+        mismatches += 1
+        for field in sorted((want or {}).keys() | (got or {}).keys()):
+            if (want or {}).get(field) != (got or {}).get(field):
+                print(f"CHANGED {job_id}.{field}")
+                print(f"  expected {(want or {}).get(field)!r}")
+                print(f"  actual   {(got or {}).get(field)!r}")
+    print(f"regression: {len(actual) - mismatches}/{len(actual)} jobs unchanged")
+    return mismatches
+
+
+def benchmark(jobs: list[dict[str, Any]], repeat: int) -> None:
+    timings: dict[str, float] = {}
+    for name, run in stages(jobs).items():
+        start = perf_counter()
+        for _ in range(repeat):
+            run()
+        timings[name] = perf_counter() - start
+
+    total = sum(timings.values())
+    processed = len(jobs) * repeat
+    print(f"{len(jobs)} jobs x {repeat}: {processed / total:,.0f} jobs/sec")
+    for name, elapsed in timings.items():
+        print(
+            f"  {name:<30} {elapsed / processed * 1e6:9.1f} us/job"
+            f"  {elapsed / total:6.1%}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument(
+        "--update", action="store_true", help="rewrite the expected outputs"
+    )
+    args = parser.parse_args()
+
+    jobs = load_jobs()
+    mismatches = check(jobs, args.update)
+    benchmark(jobs, args.repeat)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,501 @@
+"""Local stand-in for the Indeed, LinkedIn and WTTJ job boards.
+
+Serves list and detail pages built from the anonymized descriptions in
+``benchmarks/corpus/jobs.jsonl``, in the shapes the crawlers parse:
+
+* Indeed ``/jobs`` result pages and ``/viewjob`` pages with JSON-LD,
+* LinkedIn guest ``jobs-guest/jobs/api`` search and ``jobPosting`` pages,
+* WTTJ Algolia ``queries``, the ``organizations/{org}/jobs/{slug}`` API and
+  the list and job pages used by the browser crawler.
+
+Latency, HTTP errors and anti-bot pages can be injected. The crawlers read
+their site URLs from the environment at import time; ``FakeBoard.environ()``
+returns the variables that point them at the server.
+
+Run it on its own with:
+
+    python -m benchmarks.fake_board [--port 8765] [--jobs 60] [--latency-ms 50]
+        [--error-rate 0.05] [--block-rate 0.05]
+"""
+
+import argparse
+import html
+import json
+import random
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from time import sleep
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+JOBS_FILE = Path(__file__).parent / "corpus" / "jobs.jsonl"
+
+INDEED_PAGE_SIZE = 15
+LINKEDIN_PAGE_SIZE = 10
+
+_TITLES = ("Data Engineer", "Data Analyst", "Data Scientist", "ML Engineer", "BI Developer")
+_CITIES = ("Paris", "Lyon", "Nantes", "Lille", "Bordeaux", "Toulouse")
+_CONTRACTS = (
+    ("FULL_TIME", "Full-time", "full_time"),
+    ("INTERN", "Internship", "internship"),
+    ("TEMPORARY", "Contract", "temporary"),
+)
+
+_INDEED_BLOCK_PAGE = (
+    "<html><head><title>Just a moment...</title></head>"
+    "<body><p>Please verify you are a human.</p></body></html>"
+)
+_LINKEDIN_BLOCK_PAGE = (
+    "<html><head><title>Sign In | LinkedIn</title></head>"
+    '<body><div class="authwall">Join now to see this job.</div></body></html>'
+)
+
+_WTTJ_LIST_PAGE = """<html><head><title>Jobs | Welcome to the Jungle</title></head>
+<body><ul id="jobs"></ul><script>
+const params = new URLSearchParams(location.search);
+fetch({algolia_url}, {{
+  method: "POST",
+  headers: {{"Content-Type": "application/json"}},
+  body: JSON.stringify({{requests: [{{indexName: "jobs", params:
+    "query=" + encodeURIComponent(params.get("query") || "") +
+    "&page=" + ((+params.get("page") || 1) - 1) + "&hitsPerPage=15"}}]}}),
+}}).then(res => res.json()).then(data => {{
+  for (const hit of data.results[0].hits) {{
+    const link = document.createElement("a");
+    link.href = "/fr/companies/" + hit.organization.slug + "/jobs/" + hit.slug;
+    link.textContent = hit.name;
+    document.getElementById("jobs").appendChild(document.createElement("li")).appendChild(link);
+  }}
+}});
+</script></body></html>"""
+
+
+@dataclass
+class BoardConfig:
+    jobs: int = 60  # postings per platform
+    latency: float = 0.0  # seconds added to every response
+    jitter: float = 0.0  # extra random latency, up to this many seconds
+    error_rate: float = 0.0  # share of responses replaced by HTTP 503
+    block_rate: float = 0.0  # share of responses replaced by an anti-bot page
+    seed: int = 0
+
+
+@dataclass(frozen=True)
+class FakeJob:
+    index: int
+    title: str
+    company: str
+    city: str
+    contract: tuple[str, str, str]
+    published_at: datetime
+    description_html: str
+    profile_html: str | None
+    experience_level: str | None
+    education_level: str | None
+
+    @property
+    def indeed_id(self) -> str:
+        return f"fake{self.index:012d}"
+
+    @property
+    def linkedin_id(self) -> str:
+        return str(4000000000 + self.index)
+
+    @property
+    def org_slug(self) -> str:
+        return self.company.lower().replace(" ", "-")
+
+    @property
+    def slug(self) -> str:
+        return f"{self.title.lower().replace(' ', '-')}_{self.city.lower()}_{self.index}"
+
+
+def _description_html(record: dict[str, Any]) -> str:
+    if record.get("description_html"):
+        return record["description_html"]
+    paragraphs = (record.get("description_text") or "").split("\n\n")
+    return "".join(
+        f"<p>{html.escape(para).replace(chr(10), '<br>')}</p>" for para in paragraphs
+    )
+
+
+def load_jobs(count: int) -> list[FakeJob]:
+    with JOBS_FILE.open(encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    jobs = []
+    for index in range(count):
+        record = records[index % len(records)]
+        jobs.append(
+            FakeJob(
+                index=index,
+                title=f"{_TITLES[index % len(_TITLES)]} {index}",
+                company=f"Entreprise {index % 7}",
+                city=_CITIES[index % len(_CITIES)],
+                contract=_CONTRACTS[index % len(_CONTRACTS)],
+                published_at=now - timedelta(hours=3 * index),
+                description_html=_description_html(record),
+                profile_html=record.get("profile_html"),
+                experience_level=record.get("experience_level"),
+                education_level=record.get("education_level"),
+            )
+        )
+    return jobs
+
+
+class FakeBoard:
+    """Threaded HTTP server for all three boards, on one local port."""
+
+    def __init__(
+        self, config: BoardConfig | None = None, host: str = "127.0.0.1", port: int = 0
+    ) -> None:
+        self.config = config or BoardConfig()
+        self.jobs = load_jobs(self.config.jobs)
+        self._by_id: dict[tuple[str, str], FakeJob] = {}
+        for job in self.jobs:
+            self._by_id["indeed", job.indeed_id] = job
+            self._by_id["linkedin", job.linkedin_id] = job
+            self._by_id["wttj", job.slug] = job
+        self.stats: Counter[str] = Counter()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _handler_class(self))
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def environ(self) -> dict[str, str]:
+        """Environment variables pointing the crawlers at this server."""
+        return {
+            "INDEED_BASE_URL": self.url,
+            "LINKEDIN_BASE_URL": self.url,
+            "WTTJ_SITE_URL": self.url,
+            "WTTJ_ALGOLIA_URL": f"{self.url}/algolia/1/indexes/*/queries",
+            "WTTJ_JOB_API_URL": f"{self.url}/api/v1/organizations/{{org}}/jobs/{{slug}}",
+        }
+
+    def start(self) -> "FakeBoard":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def __enter__(self) -> "FakeBoard":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def fault(self) -> str | None:
+        """Draw the injected fault of one response: ``error``, ``block`` or None."""
+        with self._lock:
+            draw = self._rng.random()
+            delay = self.config.latency + self._rng.uniform(0, self.config.jitter)
+        if delay:
+            sleep(delay)
+        if draw < self.config.error_rate:
+            return "error"
+        if draw < self.config.error_rate + self.config.block_rate:
+            return "block"
+        return None
+
+    def count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def find(self, platform: str, job_id: str) -> FakeJob | None:
+        return self._by_id.get((platform, job_id))
+
+    # --- Indeed ---
+
+    def indeed_list(self, start: int) -> str:
+        cards = "".join(
+            f'<div class="job_seen_beacon"><h2 class="jobTitle">'
+            f'<a data-jk="{job.indeed_id}" href="/viewjob?jk={job.indeed_id}">'
+            f"{html.escape(job.title)}</a></h2>"
+            f'<span data-testid="company-name">{html.escape(job.company)}</span></div>'
+            for job in self.jobs[start : start + INDEED_PAGE_SIZE]
+        )
+        return (
+            "<html><head><title>Emplois : data - France | Indeed</title></head>"
+            f'<body><div id="mosaic-jobResults">{cards}</div></body></html>'
+        )
+
+    def indeed_job(self, job: FakeJob) -> str:
+        posting = {
+            "@context": "https://schema.org/",
+            "@type": "JobPosting",
+            "title": job.title,
+            "datePosted": job.published_at.isoformat(),
+            "description": job.description_html,
+            "employmentType": job.contract[0],
+            "hiringOrganization": {"@type": "Organization", "name": job.company},
+            "jobLocation": {
+                "@type": "Place",
+                "address": {"addressLocality": job.city, "addressCountry": "FR"},
+            },
+            "baseSalary": {
+                "currency": "EUR",
+                "value": {"minValue": 38000 + 1000 * (job.index % 10), "unitText": "YEAR"},
+            },
+        }
+        ld_json = json.dumps(posting, ensure_ascii=False).replace("</", "<\\/")
+        return (
+            f"<html><head><title>{html.escape(job.title)} - {job.city} - Indeed</title>"
+            f'<script type="application/ld+json">{ld_json}</script></head>'
+            f'<body><h1>{html.escape(job.title)}</h1><div id="jobDescriptionText">'
+            f"{job.description_html}</div></body></html>"
+        )
+
+    # --- LinkedIn ---
+
+    def linkedin_list(self, start: int) -> str:
+        return "".join(
+            f'<li><div class="base-card"><a class="base-card__full-link" '
+            f'href="{self.url}/jobs/view/{job.slug}-{job.linkedin_id}?trk=public_jobs">'
+            f"{html.escape(job.title)}</a></div></li>"
+            for job in self.jobs[start : start + LINKEDIN_PAGE_SIZE]
+        )
+
+    def linkedin_job(self, job: FakeJob) -> str:
+        days = max(1, (datetime.now(timezone.utc) - job.published_at).days)
+        seniority = "Internship" if job.contract[0] == "INTERN" else "Mid-Senior level"
+        return (
+            f"<html><head><title>{html.escape(job.title)}</title></head><body>"
+            f'<h2 class="top-card-layout__title">{html.escape(job.title)}</h2>'
+            f'<a class="topcard__org-name-link">{html.escape(job.company)}</a>'
+            f'<span class="topcard__flavor topcard__flavor--bullet">{job.city}, France</span>'
+            f'<span class="posted-time-ago__text">{days} days ago</span>'
+            '<ul class="description__job-criteria-list">'
+            '<li class="description__job-criteria-item">'
+            '<h3 class="description__job-criteria-subheader">Seniority level</h3>'
+            f'<span class="description__job-criteria-text">{seniority}</span></li>'
+            '<li class="description__job-criteria-item">'
+            '<h3 class="description__job-criteria-subheader">Employment type</h3>'
+            f'<span class="description__job-criteria-text">{job.contract[1]}</span></li>'
+            "</ul>"
+            f'<div class="show-more-less-html__markup">{job.description_html}</div>'
+            "</body></html>"
+        )
+
+    # --- Welcome to the Jungle ---
+
+    def wttj_hit(self, job: FakeJob) -> dict[str, Any]:
+        return {
+            "name": job.title,
+            "slug": job.slug,
+            "organization": {"name": job.company, "slug": job.org_slug},
+            "published_at": job.published_at.isoformat(),
+        }
+
+    def wttj_search(self, payload: dict[str, Any]) -> dict[str, Any]:
+        request = (payload.get("requests") or [{}])[0]
+        params = parse_qs(request.get("params") or "")
+        page = int(params.get("page", ["0"])[0])
+        per_page = int(params.get("hitsPerPage", ["15"])[0])
+        hits = [
+            self.wttj_hit(job)
+            for job in self.jobs[page * per_page : (page + 1) * per_page]
+        ]
+        return {
+            "results": [
+                {
+                    "hits": hits,
+                    "page": page,
+                    "hitsPerPage": per_page,
+                    "nbHits": len(self.jobs),
+                    "nbPages": -(-len(self.jobs) // per_page),
+                }
+            ]
+        }
+
+    def wttj_job(self, job: FakeJob) -> dict[str, Any]:
+        return {
+            "job": {
+                "name": job.title,
+                "slug": job.slug,
+                "organization": {"name": job.company, "slug": job.org_slug},
+                "office": {"city": job.city, "country_code": "FR"},
+                "contract_type": job.contract[2],
+                "salary_min": 38000 + 1000 * (job.index % 10),
+                "salary_currency": "EUR",
+                "experience_level": job.experience_level,
+                "education_level": job.education_level,
+                "description": job.description_html,
+                "profile": job.profile_html,
+                "published_at": job.published_at.isoformat(),
+            }
+        }
+
+    def wttj_list_page(self) -> str:
+        return _WTTJ_LIST_PAGE.format(
+            algolia_url=json.dumps(f"{self.url}/algolia/1/indexes/*/queries")
+        )
+
+
+def _handler_class(board: FakeBoard) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            self._route("GET")
+
+        def do_POST(self) -> None:
+            self._route("POST")
+
+        def _send(
+            self, status: int, body: str, content_type: str = "text/html; charset=utf-8"
+        ) -> None:
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            try:
+                self.wfile.write(data)
+            except (BrokenPipeError, ConnectionResetError):
+                # The crawl was cancelled while this response was delayed.
+                self.close_connection = True
+
+        def _json(self, status: int, data: Any) -> None:
+            self._send(status, json.dumps(data, ensure_ascii=False), "application/json")
+
+        def _route(self, method: str) -> None:
+            parsed = urlparse(self.path)
+            path, query = parsed.path, parse_qs(parsed.query)
+            if path == "/__stats":
+                return self._json(200, dict(board.stats))
+
+            payload: dict[str, Any] = {}
+            if method == "POST":
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    return self._json(400, {"message": "invalid JSON"})
+
+            route = _resolve(method, path)
+            if route is None:
+                return self._send(404, "<html><title>Not found</title></html>")
+            platform, page = route
+            board.count(f"{platform}.{page}")
+
+            fault = board.fault()
+            if fault == "error":
+                board.count(f"{platform}.error")
+                return self._send(503, "<html><title>Service unavailable</title></html>")
+            if fault == "block":
+                board.count(f"{platform}.blocked")
+                if platform == "indeed":
+                    return self._send(403, _INDEED_BLOCK_PAGE)
+                if platform == "linkedin":
+                    return self._send(200, _LINKEDIN_BLOCK_PAGE)
+                return self._json(429, {"message": "Too many requests"})
+
+            start = int((query.get("start") or ["0"])[0] or 0)
+            if (platform, page) == ("indeed", "list"):
+                return self._send(200, board.indeed_list(start))
+            if (platform, page) == ("linkedin", "list"):
+                return self._send(200, board.linkedin_list(start))
+            if (platform, page) == ("wttj", "search"):
+                return self._json(200, board.wttj_search(payload))
+            if (platform, page) == ("wttj", "list"):
+                return self._send(200, board.wttj_list_page())
+
+            job = _find_job(board, platform, path, query)
+            if job is None:
+                return self._send(404, "<html><title>Job not found</title></html>")
+            if (platform, page) == ("indeed", "job"):
+                return self._send(200, board.indeed_job(job))
+            if (platform, page) == ("linkedin", "job"):
+                return self._send(200, board.linkedin_job(job))
+            if (platform, page) == ("wttj", "api"):
+                return self._json(200, board.wttj_job(job))
+            return self._send(200, f"<html><title>{html.escape(job.title)}</title></html>")
+
+    return Handler
+
+
+def _resolve(method: str, path: str) -> tuple[str, str] | None:
+    if method == "POST":
+        return ("wttj", "search") if path.startswith("/algolia/") else None
+    if path == "/jobs":
+        return "indeed", "list"
+    if path == "/viewjob":
+        return "indeed", "job"
+    if path.startswith("/jobs-guest/jobs/api/seeMoreJobPostings"):
+        return "linkedin", "list"
+    if path.startswith("/jobs-guest/jobs/api/jobPosting/"):
+        return "linkedin", "job"
+    if path.startswith("/api/v1/organizations/"):
+        return "wttj", "api"
+    if path == "/fr/jobs":
+        return "wttj", "list"
+    if path.startswith("/fr/companies/"):
+        return "wttj", "job"
+    return None
+
+
+def _find_job(
+    board: FakeBoard, platform: str, path: str, query: dict[str, list[str]]
+) -> FakeJob | None:
+    if platform == "indeed":
+        return board.find(platform, (query.get("jk") or [""])[0])
+    return board.find(platform, path.rstrip("/").rsplit("/", 1)[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--jobs", type=int, default=60, help="postings per platform")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--block-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    board = FakeBoard(
+        BoardConfig(
+            jobs=args.jobs,
+            latency=args.latency_ms / 1000,
+            jitter=args.jitter_ms / 1000,
+            error_rate=args.error_rate,
+            block_rate=args.block_rate,
+            seed=args.seed,
+        ),
+        host=args.host,
+        port=args.port,
+    )
+    print(f"fake job board on {board.url}; point the crawlers at it with:")
+    for name, value in board.environ().items():
+        print(f"  export {name}='{value}'")
+    try:
+        board.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,22 @@
 from src.db.model import Base
-from src.db.database import engine
+from src.db.database import async_engine, engine
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from src.app.router import job_router, crawler_router
+from src.app.runs import CrawlRunner
+from src.webcrawler.orchestrator import CrawlOrchestrator
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with CrawlOrchestrator() as orchestrator, CrawlRunner(orchestrator) as runner:
+        app.state.crawl_orchestrator = orchestrator
+        app.state.crawl_runner = runner
+        yield
+    await async_engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
 app.include_router(job_router)
 app.include_router(crawler_router)
 # Base.metadata.drop_all(bind=engine)
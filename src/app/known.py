@@ -0,0 +1,50 @@
+import asyncio
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.model import Job, PlatformType
+from src.webcrawler.seen import JobKey, job_keys
+
+
+class StoredJobKeys:
+    """Posting keys of the ``job`` rows of one platform, kept between crawls.
+
+    Each ``load`` reads only the rows added since the previous one. When the
+    row count no longer matches what was read, rows were deleted or
+    committed behind the last id read, and the keys are reloaded from
+    scratch.
+    """
+
+    def __init__(self, platform: PlatformType) -> None:
+        self.platform = platform
+        self.keys: frozenset[JobKey] = frozenset()
+        self._rows = 0
+        self._last_id = 0
+        self._lock = asyncio.Lock()
+
+    async def _read(self, db: AsyncSession, after_id: int) -> tuple[list[str], int]:
+        query = select(Job.id, Job.url).where(
+            Job.platform == self.platform, Job.id > after_id
+        )
+        rows = (await db.execute(query)).all()
+        return [url for _, url in rows], max((id for id, _ in rows), default=after_id)
+
+    async def load(self, db: AsyncSession) -> frozenset[JobKey]:
+        async with self._lock:
+            urls, last_id = await self._read(db, self._last_id)
+            rows = await db.scalar(
+                select(func.count()).where(Job.platform == self.platform)
+            )
+            if rows != self._rows + len(urls):
+                urls, last_id = await self._read(db, 0)
+                self.keys, self._rows = frozenset(), 0
+            if urls:
+                # A new set, so runs still using the previous one keep it unchanged.
+                self.keys = self.keys | job_keys(urls)
+            self._rows += len(urls)
+            self._last_id = last_id
+            return self.keys
+
+
+stored_jobs = {platform: StoredJobKeys(platform) for platform in PlatformType}
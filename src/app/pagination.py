@@ -0,0 +1,81 @@
+import base64
+import json
+from datetime import datetime
+from typing import Literal, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import Select, and_, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.model import Job
+
+SortOrder = Literal["desc", "asc"]
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(job: Job) -> str:
+    payload = json.dumps([job.created_at.isoformat(), job.id])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, job_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(job_id)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {cursor}") from e
+
+
+def _created_at_key(dialect_name: str, value=None):
+    # SQLite keeps CURRENT_TIMESTAMP and bound datetimes as differently formatted
+    # strings, so compare them as julian days to keep equal timestamps equal.
+    if dialect_name == "sqlite":
+        return func.julianday(Job.created_at if value is None else value)
+    return Job.created_at if value is None else value
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    limit: int,
+    order: SortOrder = "desc",
+    cursor: Optional[str] = None,
+) -> tuple[list, Optional[str]]:
+    """Return one keyset page of ``query`` ordered by ``(created_at, id)``.
+
+    Fetches ``limit + 1`` rows to know whether another page exists and returns
+    the cursor of the last row on this page in that case.
+    """
+    dialect_name = db.bind.dialect.name
+    created_at = _created_at_key(dialect_name)
+
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        cursor_key = _created_at_key(dialect_name, cursor_created_at)
+        if order == "asc":
+            query = query.where(
+                or_(
+                    created_at > cursor_key,
+                    and_(created_at == cursor_key, Job.id > cursor_id),
+                )
+            )
+        else:
+            query = query.where(
+                or_(
+                    created_at < cursor_key,
+                    and_(created_at == cursor_key, Job.id < cursor_id),
+                )
+            )
+
+    if order == "asc":
+        query = query.order_by(created_at.asc(), Job.id.asc())
+    else:
+        query = query.order_by(created_at.desc(), Job.id.desc())
+
+    rows = list(await db.scalars(query.limit(limit + 1)))
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1])
@@ -0,0 +1,47 @@
+from typing import Iterable, Optional
+
+from fastapi import HTTPException
+from sqlalchemy.orm import load_only
+
+from src.app.schema import JobSummary
+from src.db.model import Job
+
+SUMMARY_FIELDS = (
+    "url",
+    "platform",
+    "title",
+    "company",
+    "location",
+    "contract",
+    "exp_level",
+    "published_at",
+)
+# Always loaded: identify the row and build keyset cursors.
+_REQUIRED_FIELDS = ("id", "created_at")
+_ALLOWED_FIELDS = frozenset(JobSummary.model_fields)
+
+
+def parse_fields(fields: Optional[str]) -> tuple[str, ...]:
+    """Turn a ``fields=title,company`` query value into the columns to load."""
+    requested = (
+        [field.strip() for field in fields.split(",") if field.strip()]
+        if fields
+        else list(SUMMARY_FIELDS)
+    )
+    unknown = sorted(set(requested) - _ALLOWED_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    return tuple(dict.fromkeys([*_REQUIRED_FIELDS, *requested]))
+
+
+def load_fields(fields: tuple[str, ...]):
+    return load_only(*(getattr(Job, field) for field in fields), raiseload=True)
+
+
+def project(rows: Iterable[Job], fields: tuple[str, ...]) -> list[JobSummary]:
+    return [
+        JobSummary.model_validate({field: getattr(row, field) for field in fields})
+        for row in rows
+    ]
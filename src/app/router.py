@@ -1,75 +1,94 @@
+import logging
 from operator import and_
 from typing import Optional
-from sqlalchemy import or_, and_
-from fastapi import FastAPI, Depends, Query
+from sqlalchemy import or_, and_, select
+from fastapi import FastAPI, Depends, HTTPException, Query, Request
 from fastapi.routing import APIRouter
-from sqlalchemy.orm import Session
-from src.db.database import get_db
-from src.app.schema import JobResponse, JobCreate, JobBulkCreate
-from src.db.model import Job
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer_group
+from src.db.database import AsyncSessionLocal, get_db
+from src.app.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, SortOrder, paginate
+from src.app.projection import load_fields, parse_fields, project
+from src.app.known import stored_jobs
+from src.app.runs import CrawlRunner
+from src.app.sink import JobSink
+from src.app.streaming import StreamFormat, stream_jobs
+from src.app.schema import (
+    CrawlBatchResult,
+    CrawlRunCreate,
+    CrawlRunResponse,
+    CrawlSaveResult,
+    CrawlSearch,
+    JobBulkCreate,
+    JobCreate,
+    JobPage,
+    JobResponse,
+    JobSummary,
+)
+from src.db.model import Job, PlatformType
+from src.db.search import search
+from src.db.upsert import (
+    DEFAULT_CHUNK_SIZE,
+    MAX_CHUNK_SIZE,
+    ConflictMode,
+    upsert_jobs,
+)
 from typing import List
-from src.webcrawler.service import crawl_indeed_jobs, crawl_wttj_jobs
+from src.webcrawler.orchestrator import CrawlOrchestrator
 
 app = FastAPI(title="Job_API")
 job_router = APIRouter(prefix="/job")
 crawler_router = APIRouter(prefix="/crawler")
+logger = logging.getLogger(__name__)
 
 
 @job_router.post("/", response_model=JobResponse)
-def create_job(job: JobCreate, db: Session = Depends(get_db)):
-    existing = (
-        db.query(Job)
-        .filter(
-            Job.platform == job.platform, Job.url == job.url, Job.title == job.title
-        )
-        .first()
+async def create_job(job: JobCreate, db: AsyncSession = Depends(get_db)):
+    existing = await db.scalar(
+        select(Job)
+        .where(Job.platform == job.platform, Job.url == job.url, Job.title == job.title)
+        .options(undefer_group("text"))
     )
     if existing:
         return existing
 
     new_job = Job(**job.model_dump())
     db.add(new_job)
-    db.commit()
-    db.refresh(new_job)
+    await db.commit()
+    # Only the server default is missing; the rest was just written.
+    await db.refresh(new_job, ["created_at"])
     return new_job
 
 
 @job_router.post("/bulk", response_model=List[JobResponse])
-def create_jobs(jobs: JobBulkCreate, db: Session = Depends(get_db)):
-    results: list[Job] = []
-
-    for job in jobs.jobs:
-        existing = (
-            db.query(Job)
-            .filter(
-                Job.platform == job.platform, Job.url == job.url, Job.title == job.title
-            )
-            .first()
-        )
-        if existing:
-            results.append(existing)
-            continue
-
-        row = Job(**job.model_dump())
-        db.add(row)
-        results.append(row)
-
-    db.commit()
-    for row in results:
-        db.refresh(row)
+async def create_jobs(
+    jobs: JobBulkCreate,
+    chunk_size: int = Query(default=DEFAULT_CHUNK_SIZE, ge=1, le=MAX_CHUNK_SIZE),
+    on_conflict: ConflictMode = "ignore",
+    db: AsyncSession = Depends(get_db),
+):
+    rows = await db.run_sync(
+        upsert_jobs, jobs.jobs, chunk_size=chunk_size, on_conflict=on_conflict
+    )
+    results = [JobResponse.model_validate(row) for row in rows]
+    await db.commit()
     return results
 
 
-@job_router.get("/", response_model=List[JobResponse])
-def get_job(
+@job_router.get("/", response_model=JobPage, response_model_exclude_unset=True)
+async def get_job(
     title: Optional[str] = None,
     location: Optional[str] = None,
     exp_level: Optional[str] = None,
     contract: Optional[str] = None,
-    db: Session = Depends(get_db),
+    platform: Optional[PlatformType] = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    order: SortOrder = "desc",
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
 ):
-    query = db.query(Job)
-    jobs = query.all()
+    selected = parse_fields(fields)
     conditions = []
     if title:
         conditions.append(Job.title.ilike(f"%{title}%"))
@@ -79,17 +98,89 @@ def get_job(
         conditions.append(Job.exp_level == exp_level)
     if contract:
         conditions.append(Job.contract == contract)
+    if platform:
+        conditions.append(Job.platform == platform)
+
+    query = select(Job).options(load_fields(selected))
     if conditions:
-        jobs = query.filter(and_(*conditions)).all()
-    return jobs
+        query = query.where(and_(*conditions))
+    jobs, next_cursor = await paginate(db, query, limit=limit, order=order, cursor=cursor)
+    return JobPage(items=project(jobs, selected), next_cursor=next_cursor)
+
+
+@job_router.get(
+    "/search", response_model=List[JobSummary], response_model_exclude_unset=True
+)
+async def search_jobs(
+    q: str = Query(min_length=1),
+    location: Optional[str] = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    q = q.strip()
+    if not q:
+        raise HTTPException(status_code=400, detail="Search query q is blank")
+    selected = parse_fields(fields)
+    query = select(Job).options(load_fields(selected))
+    if location:
+        query = query.where(Job.location.ilike(f"%{location}%"))
+    query = search(query, q, db.bind.dialect.name).limit(limit)
+    return project(await db.scalars(query), selected)
+
+
+@job_router.get("/{job_id}", response_model=JobResponse)
+async def get_job_detail(job_id: int, db: AsyncSession = Depends(get_db)):
+    job = await db.get(Job, job_id, options=[undefer_group("text")])
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+def get_orchestrator(request: Request) -> CrawlOrchestrator:
+    orchestrator = getattr(request.app.state, "crawl_orchestrator", None)
+    if orchestrator is None:
+        raise HTTPException(status_code=503, detail="Crawl orchestrator is not running")
+    return orchestrator
+
+
+def get_crawl_runner(request: Request) -> CrawlRunner:
+    runner = getattr(request.app.state, "crawl_runner", None)
+    if runner is None:
+        raise HTTPException(status_code=503, detail="Crawl runner is not running")
+    return runner
+
+
+_CRAWL_PLATFORMS = {
+    "indeed": PlatformType.Indeed,
+    "wttj": PlatformType.WTTJ,
+    "linkedin": PlatformType.Linkedin,
+}
+
+
+async def _load_known_jobs(platform: str, incremental: bool):
+    if not incremental:
+        return None
+    # A session of its own, so no connection stays checked out while crawling.
+    async with AsyncSessionLocal() as db:
+        return await stored_jobs[_CRAWL_PLATFORMS[platform]].load(db)
 
 
 @crawler_router.post("/indeed", response_model=List[JobCreate])
 async def run_indeed_crawler(
     title: str = "data scientist",
     location: str = "Paris",
+    count: int = Query(default=30, ge=1, le=300),
+    incremental: bool = True,
+    orchestrator: CrawlOrchestrator = Depends(get_orchestrator),
 ):
-    jobs = await crawl_indeed_jobs(title=title, location=location)
+    jobs = await orchestrator.crawl(
+        "indeed",
+        title=title,
+        location=location,
+        count=count,
+        known_jobs=await _load_known_jobs("indeed", incremental),
+    )
     return [JobCreate(**job) for job in jobs]
 
 
@@ -98,6 +189,183 @@ async def run_wttj_crawler(
     title: str = "data scientist",
     location: Optional[str] = "Paris",
     count: int = Query(default=30, ge=1, le=300),
+    incremental: bool = True,
+    orchestrator: CrawlOrchestrator = Depends(get_orchestrator),
+):
+    jobs = await orchestrator.crawl(
+        "wttj",
+        title=title,
+        location=location,
+        count=count,
+        known_jobs=await _load_known_jobs("wttj", incremental),
+    )
+    return [JobCreate(**job) for job in jobs]
+
+
+@crawler_router.post("/linkedin", response_model=List[JobCreate])
+async def run_linkedin_crawler(
+    title: str = "data scientist",
+    location: str = "Paris",
+    count: int = Query(default=30, ge=1, le=300),
+    incremental: bool = True,
+    orchestrator: CrawlOrchestrator = Depends(get_orchestrator),
 ):
-    jobs = await crawl_wttj_jobs(title=title, location=location, count=count)
+    jobs = await orchestrator.crawl(
+        "linkedin",
+        title=title,
+        location=location,
+        count=count,
+        known_jobs=await _load_known_jobs("linkedin", incremental),
+    )
     return [JobCreate(**job) for job in jobs]
+
+
+@crawler_router.post("/indeed/stream")
+async def stream_indeed_crawler(
+    title: str = "data scientist",
+    location: str = "Paris",
+    count: int = Query(default=30, ge=1, le=300),
+    incremental: bool = True,
+    format: StreamFormat = "ndjson",
+    orchestrator: CrawlOrchestrator = Depends(get_orchestrator),
+):
+    """Like ``/crawler/indeed``, but sends each job as soon as it is crawled."""
+    items = orchestrator.stream(
+        "indeed",
+        title=title,
+        location=location,
+        count=count,
+        known_jobs=await _load_known_jobs("indeed", incremental),
+    )
+    return stream_jobs(items, format)
+
+
+@crawler_router.post("/wttj/stream")
+async def stream_wttj_crawler(
+    title: str = "data scientist",
+    location: Optional[str] = "Paris",
+    count: int = Query(default=30, ge=1, le=300),
+    incremental: bool = True,
+    format: StreamFormat = "ndjson",
+    orchestrator: CrawlOrchestrator = Depends(get_orchestrator),
+):
+    """Like ``/crawler/wttj``, in crawl order instead of newest first."""
+    items = orchestrator.stream(
+        "wttj",
+        title=title,
+        location=location,
+        count=count,
+        known_jobs=await _load_known_jobs("wttj", incremental),
+        limit=count,
+    )
+    return stream_jobs(items, format)
+
+
+@crawler_router.post("/linkedin/stream")
+async def stream_linkedin_crawler(
+    title: str = "data scientist",
+    location: str = "Paris",
+    count: int = Query(default=30, ge=1, le=300),
+    incremental: bool = True,
+    format: StreamFormat = "ndjson",
+    orchestrator: CrawlOrchestrator = Depends(get_orchestrator),
+):
+    """Like ``/crawler/linkedin``, in crawl order instead of newest first."""
+    items = orchestrator.stream(
+        "linkedin",
+        title=title,
+        location=location,
+        count=count,
+        known_jobs=await _load_known_jobs("linkedin", incremental),
+        limit=count,
+    )
+    return stream_jobs(items, format)
+
+
+@crawler_router.post("/save", response_model=CrawlSaveResult)
+async def save_crawl(
+    search: CrawlSearch,
+    orchestrator: CrawlOrchestrator = Depends(get_orchestrator),
+):
+    """Crawl one search straight into the ``job`` table and report the counts."""
+    items = orchestrator.stream(
+        search.platform,
+        title=search.title,
+        location=search.location,
+        count=search.count,
+        known_jobs=await _load_known_jobs(search.platform, search.incremental),
+        limit=search.count,
+    )
+    sink = JobSink()
+    error = None
+    try:
+        await sink.consume(items)
+    except Exception as e:
+        logger.exception("Crawl of %s stopped after %s jobs", search.platform, sink.received)
+        error = str(e)
+    return CrawlSaveResult(
+        **search.model_dump(), **sink.counts().model_dump(), error=error
+    )
+
+
+@crawler_router.post("/runs", response_model=CrawlRunResponse, status_code=202)
+async def create_crawl_run(
+    search: CrawlRunCreate,
+    runner: CrawlRunner = Depends(get_crawl_runner),
+):
+    """Start a crawl in the background; poll ``GET /crawler/runs/{id}`` for it."""
+    known_jobs = await _load_known_jobs(search.platform, search.incremental)
+    return runner.submit(search, known_jobs).report()
+
+
+@crawler_router.get("/runs/{run_id}", response_model=CrawlRunResponse)
+def get_crawl_run(run_id: str, runner: CrawlRunner = Depends(get_crawl_runner)):
+    run = runner.get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Crawl run {run_id} not found")
+    return run.report()
+
+
+@crawler_router.delete("/runs/{run_id}", response_model=CrawlRunResponse)
+async def cancel_crawl_run(
+    run_id: str, runner: CrawlRunner = Depends(get_crawl_runner)
+):
+    run = await runner.cancel(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Crawl run {run_id} not found")
+    return run.report()
+
+
+@crawler_router.get("/rates")
+def get_crawl_rates(orchestrator: CrawlOrchestrator = Depends(get_orchestrator)):
+    return orchestrator.rate_controller.snapshot()
+
+
+@crawler_router.post("/batch", response_model=List[CrawlBatchResult])
+async def run_crawler_batch(
+    searches: List[CrawlSearch],
+    orchestrator: CrawlOrchestrator = Depends(get_orchestrator),
+):
+    known_jobs = {
+        platform: await _load_known_jobs(platform, True)
+        for platform in {search.platform for search in searches if search.incremental}
+    }
+    results = await orchestrator.crawl_many(
+        [
+            {
+                **search.model_dump(exclude={"incremental"}),
+                "known_jobs": known_jobs.get(search.platform)
+                if search.incremental
+                else None,
+            }
+            for search in searches
+        ]
+    )
+    return [
+        CrawlBatchResult(
+            **search.model_dump(),
+            jobs=[] if isinstance(result, BaseException) else result,
+            error=str(result) if isinstance(result, BaseException) else None,
+        )
+        for search, result in zip(searches, results)
+    ]
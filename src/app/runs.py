@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import os
+from collections import OrderedDict
+from contextlib import aclosing
+from datetime import datetime, timezone
+from typing import AbstractSet
+from uuid import uuid4
+
+from pydantic import ValidationError
+
+from src.app.schema import (
+    CrawlRunCreate,
+    CrawlRunProgress,
+    CrawlRunResponse,
+    CrawlRunStatus,
+    JobCreate,
+)
+from src.app.sink import JobSink
+from src.webcrawler.orchestrator import CrawlOrchestrator
+from src.webcrawler.progress import CrawlProgress
+from src.webcrawler.seen import JobKey
+
+logger = logging.getLogger(__name__)
+
+CRAWL_MAX_RUNS = max(1, int(os.getenv("CRAWL_MAX_RUNS", "4")))
+CRAWL_RUN_HISTORY = max(1, int(os.getenv("CRAWL_RUN_HISTORY", "100")))
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class CrawlRun:
+    """One crawl search submitted to a ``CrawlRunner`` and its outcome so far."""
+
+    def __init__(self, search: CrawlRunCreate) -> None:
+        self.id = uuid4().hex
+        self.search = search
+        self.status: CrawlRunStatus = "queued"
+        self.created_at = _now()
+        self.started_at: datetime | None = None
+        self.finished_at: datetime | None = None
+        self.progress = CrawlProgress()
+        self.sink = JobSink() if search.save else None
+        self.jobs: list[JobCreate] = []
+        self.error: str | None = None
+        self.task: asyncio.Task | None = None
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    def report(self) -> CrawlRunResponse:
+        return CrawlRunResponse(
+            **self.search.model_dump(),
+            id=self.id,
+            status=self.status,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            progress=CrawlRunProgress(
+                pages=self.progress.pages,
+                items=self.sink.received if self.sink else len(self.jobs),
+                errors=self.progress.errors,
+            ),
+            saved=self.sink.counts() if self.sink else None,
+            jobs=None if self.sink else list(self.jobs),
+            error=self.error,
+        )
+
+
+class CrawlRunner:
+    """Runs crawl searches in the background and keeps their status to poll.
+
+    At most ``max_runs`` crawls run at once; later ones wait as ``queued``.
+    Runs live in memory, and only the latest ``history`` finished runs are
+    kept. Runs still going when the runner closes are cancelled.
+    """
+
+    def __init__(
+        self,
+        orchestrator: CrawlOrchestrator,
+        max_runs: int = CRAWL_MAX_RUNS,
+        history: int = CRAWL_RUN_HISTORY,
+    ) -> None:
+        self.orchestrator = orchestrator
+        self.history = history
+        self._slots = asyncio.Semaphore(max_runs)
+        self._runs: OrderedDict[str, CrawlRun] = OrderedDict()
+
+    async def __aenter__(self) -> "CrawlRunner":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        tasks = [run.task for run in self._runs.values() if run.task and not run.done]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def submit(
+        self, search: CrawlRunCreate, known_jobs: AbstractSet[JobKey] | None = None
+    ) -> CrawlRun:
+        run = CrawlRun(search)
+        self._runs[run.id] = run
+        self._forget_old_runs()
+        run.task = asyncio.create_task(self._execute(run, known_jobs))
+        return run
+
+    def get(self, run_id: str) -> CrawlRun | None:
+        return self._runs.get(run_id)
+
+    async def cancel(self, run_id: str) -> CrawlRun | None:
+        """Cancel a queued or running crawl and wait until it has stopped."""
+        run = self._runs.get(run_id)
+        if run is not None and run.task is not None and not run.done:
+            run.task.cancel()
+            await asyncio.gather(run.task, return_exceptions=True)
+        return run
+
+    def _forget_old_runs(self) -> None:
+        finished = [run_id for run_id, run in self._runs.items() if run.done]
+        for run_id in finished[: max(0, len(finished) - self.history)]:
+            del self._runs[run_id]
+
+    async def _collect(self, run: CrawlRun, items) -> None:
+        async with aclosing(items):
+            async for item in items:
+                try:
+                    run.jobs.append(JobCreate(**item))
+                except ValidationError as e:
+                    logger.warning(
+                        "Dropping invalid crawl item %s: %s", item.get("url"), e
+                    )
+
+    async def _execute(
+        self, run: CrawlRun, known_jobs: AbstractSet[JobKey] | None
+    ) -> None:
+        search = run.search
+        try:
+            async with self._slots:
+                run.status = "running"
+                run.started_at = _now()
+                try:
+                    # The crawl task started by stream() inherits the bound progress.
+                    with run.progress.bind():
+                        items = self.orchestrator.stream(
+                            search.platform,
+                            title=search.title,
+                            location=search.location,
+                            count=search.count,
+                            known_jobs=known_jobs,
+                            limit=search.count,
+                        )
+                        if run.sink is not None:
+                            await run.sink.consume(items)
+                        else:
+                            await self._collect(run, items)
+                except Exception as e:
+                    logger.exception("Crawl run %s failed", run.id)
+                    run.status = "failed"
+                    run.error = str(e)
+                else:
+                    if run.sink is not None and run.sink.failed:
+                        run.status = "failed"
+                        run.error = f"Could not save {run.sink.failed} crawled jobs"
+                    else:
+                        run.status = "succeeded"
+        except asyncio.CancelledError:
+            # Also reached by runs cancelled while still queued.
+            run.status = "cancelled"
+            raise
+        finally:
+            run.finished_at = _now()
@@ -1,7 +1,7 @@
 from datetime import datetime
-from pydantic import BaseModel, ConfigDict, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from src.db.model import PlatformType
-from typing import Optional
+from typing import Literal, Optional
 
 
 class JobBase(BaseModel):
@@ -56,3 +56,84 @@ class JobResponse(JobBase):
     id: int
     model_config = ConfigDict(from_attributes=True)
     created_at: datetime
+
+
+class JobSummary(BaseModel):
+    """Projection of a job carrying only the fields that were selected.
+
+    Unselected fields stay unset and are dropped from responses built with
+    ``response_model_exclude_unset=True``.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    url: Optional[str] = None
+    platform: Optional[PlatformType] = None
+    title: Optional[str] = None
+    company: Optional[str] = None
+    location: Optional[str] = None
+    contract: Optional[str] = None
+    salary: Optional[int] = None
+    currency: Optional[str] = None
+    job_desc: Optional[str] = None
+    job_reqs: Optional[str] = None
+    exp_level: Optional[str] = None
+    edu_level: Optional[str] = None
+    published_at: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class JobPage(BaseModel):
+    items: list[JobSummary]
+    next_cursor: Optional[str] = None
+
+
+class CrawlSearch(BaseModel):
+    platform: Literal["indeed", "wttj", "linkedin"]
+    title: str = "data scientist"
+    location: Optional[str] = "Paris"
+    count: int = Field(default=30, ge=1, le=300)
+    incremental: bool = True
+
+
+class CrawlBatchResult(CrawlSearch):
+    jobs: list[JobCreate]
+    error: Optional[str] = None
+
+
+class CrawlSaveCounts(BaseModel):
+    received: int
+    inserted: int
+    duplicates: int
+    invalid: int
+    failed: int
+
+
+class CrawlSaveResult(CrawlSearch, CrawlSaveCounts):
+    error: Optional[str] = None
+
+
+CrawlRunStatus = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+
+
+class CrawlRunCreate(CrawlSearch):
+    # Write the jobs to the database; otherwise return them with the run.
+    save: bool = True
+
+
+class CrawlRunProgress(BaseModel):
+    pages: int
+    items: int
+    errors: int
+
+
+class CrawlRunResponse(CrawlRunCreate):
+    id: str
+    status: CrawlRunStatus
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    progress: CrawlRunProgress
+    saved: Optional[CrawlSaveCounts] = None
+    jobs: Optional[list[JobCreate]] = None
+    error: Optional[str] = None
@@ -0,0 +1,104 @@
+import logging
+import os
+from contextlib import aclosing
+from typing import Any, AsyncGenerator
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.app.schema import CrawlSaveCounts, JobCreate
+from src.db.database import AsyncSessionLocal
+from src.db.upsert import insert_new_jobs
+
+logger = logging.getLogger(__name__)
+
+SINK_BATCH_SIZE = max(1, int(os.getenv("CRAWL_SINK_BATCH_SIZE", "100")))
+SINK_MAX_FAILED_FLUSHES = max(1, int(os.getenv("CRAWL_SINK_MAX_FAILED_FLUSHES", "3")))
+
+
+class JobSinkError(Exception):
+    pass
+
+
+class JobSink:
+    """Writes crawl items to the ``job`` table in batches while the crawl runs.
+
+    Each batch is committed on its own, so the jobs crawled before a failure
+    are kept. A batch that fails to write stays buffered and is retried once
+    the next batch is full; whatever is still buffered after the last flush
+    is counted as ``failed``. After ``max_failed_flushes`` failures in a row
+    ``add`` raises ``JobSinkError``, so the crawl stops instead of buffering
+    every job in memory.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        batch_size: int = SINK_BATCH_SIZE,
+        max_failed_flushes: int = SINK_MAX_FAILED_FLUSHES,
+    ) -> None:
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.max_failed_flushes = max_failed_flushes
+        self.received = 0
+        self.invalid = 0
+        self.inserted = 0
+        self.duplicates = 0
+        # Buffered jobs whose last write attempt failed.
+        self.failed = 0
+        self._buffer: list[JobCreate] = []
+        self._flush_at = batch_size
+        self._failed_flushes = 0
+
+    def counts(self) -> CrawlSaveCounts:
+        return CrawlSaveCounts(
+            received=self.received,
+            inserted=self.inserted,
+            duplicates=self.duplicates,
+            invalid=self.invalid,
+            failed=self.failed,
+        )
+
+    async def add(self, item: dict[str, Any]) -> None:
+        self.received += 1
+        try:
+            self._buffer.append(JobCreate(**item))
+        except ValidationError as e:
+            self.invalid += 1
+            logger.warning("Dropping invalid crawl item %s: %s", item.get("url"), e)
+            return
+        if len(self._buffer) >= self._flush_at:
+            await self.flush()
+            if self._failed_flushes >= self.max_failed_flushes:
+                raise JobSinkError(
+                    f"Could not save crawled jobs {self._failed_flushes} times in a row"
+                )
+
+    async def flush(self) -> None:
+        if not self._buffer:
+            return
+        batch = self._buffer
+        try:
+            async with self.session_factory() as db, db.begin():
+                inserted = await insert_new_jobs(db, batch)
+        except Exception:
+            logger.exception("Could not save %s crawled jobs; keeping them", len(batch))
+            self.failed = len(batch)
+            self._flush_at = len(batch) + self.batch_size
+            self._failed_flushes += 1
+            return
+        self._buffer = []
+        self._flush_at = self.batch_size
+        self._failed_flushes = 0
+        self.failed = 0
+        self.inserted += inserted
+        self.duplicates += len(batch) - inserted
+
+    async def consume(self, items: AsyncGenerator[dict[str, Any], None]) -> None:
+        """Save every item of ``items``, flushing what is left even if it fails."""
+        try:
+            async with aclosing(items):
+                async for item in items:
+                    await self.add(item)
+        finally:
+            await self.flush()
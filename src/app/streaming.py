@@ -0,0 +1,63 @@
+import json
+import logging
+from contextlib import aclosing
+from typing import Any, AsyncGenerator, AsyncIterator, Literal
+
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+
+from src.app.schema import JobCreate
+
+logger = logging.getLogger(__name__)
+
+StreamFormat = Literal["ndjson", "sse"]
+
+_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+
+def _ndjson(data: Any) -> str:
+    return json.dumps(data, ensure_ascii=False) + "\n"
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _encode(
+    items: AsyncGenerator[dict[str, Any], None], format: StreamFormat
+) -> AsyncIterator[str]:
+    count = 0
+    try:
+        # Closing the items cancels the crawl when the client goes away.
+        async with aclosing(items):
+            async for item in items:
+                try:
+                    job = JobCreate(**item).model_dump(mode="json")
+                except ValidationError as e:
+                    logger.warning("Dropping invalid crawl item %s: %s", item.get("url"), e)
+                    continue
+                count += 1
+                yield _sse("job", job) if format == "sse" else _ndjson(job)
+    except Exception as e:
+        # The status line is already sent; report the failure in the stream.
+        logger.exception("Streamed crawl failed after %s jobs", count)
+        error = {"error": str(e), "count": count}
+        yield _sse("error", error) if format == "sse" else _ndjson(error)
+        return
+    if format == "sse":
+        yield _sse("end", {"count": count})
+
+
+def stream_jobs(
+    items: AsyncGenerator[dict[str, Any], None], format: StreamFormat = "ndjson"
+) -> StreamingResponse:
+    """Send crawl items as they arrive, one JSON job per line or per SSE event.
+
+    Each chunk is written before the next item is pulled, so a slow client
+    holds the crawl back instead of buffering its results.
+    """
+    return StreamingResponse(
+        _encode(items, format),
+        media_type=_MEDIA_TYPES[format],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,7 +1,10 @@
 import json
+import logging
 import os
+import time
 from datetime import datetime, timedelta
-from urllib import parse, request
+from typing import Any
+from urllib import request
 
 from airflow.decorators import dag, task
 
@@ -9,6 +12,11 @@ DEFAULT_API_BASE_URL = "http://127.0.0.1:8000"
 DEFAULT_CRAWL_TITLE = "data scientist"
 DEFAULT_CRAWL_LOCATION = "Paris"
 DEFAULT_CRAWL_COUNT = 30
+REQUEST_TIMEOUT = 30
+POLL_INTERVAL = 10
+RUN_TIMEOUT = 1800
+
+logger = logging.getLogger(__name__)
 
 
 def _runtime_config() -> tuple[str, str, str, int]:
@@ -22,17 +30,57 @@ def _runtime_config() -> tuple[str, str, str, int]:
     return api_base_url, crawl_title, crawl_location, max(1, crawl_count)
 
 
-def _post_json(url: str, payload: dict | None = None) -> list[dict]:
+def _request_json(url: str, payload: dict | None = None, method: str = "GET") -> Any:
     body = None
     headers = {}
     if payload is not None:
         body = json.dumps(payload).encode("utf-8")
         headers["Content-Type"] = "application/json"
-    req = request.Request(url=url, data=body, headers=headers, method="POST")
-    with request.urlopen(req, timeout=1800) as response:
+    req = request.Request(url=url, data=body, headers=headers, method=method)
+    with request.urlopen(req, timeout=REQUEST_TIMEOUT) as response:
         return json.loads(response.read().decode("utf-8"))
 
 
+def _post_json(url: str, payload: dict | None = None) -> Any:
+    return _request_json(url, payload, method="POST")
+
+
+def _save_crawl(platform: str) -> dict:
+    """Run one platform's crawl into the job table through the API.
+
+    The API answers with a run id right away; the run is polled until it
+    finishes and its save counts are returned. A run that does not succeed
+    fails the task, and one still going after ``RUN_TIMEOUT`` is cancelled.
+    """
+    api_base_url, crawl_title, crawl_location, crawl_count = _runtime_config()
+    search = {
+        "platform": platform,
+        "title": crawl_title,
+        "location": crawl_location,
+        "count": crawl_count,
+    }
+    run = _post_json(f"{api_base_url}/crawler/runs", search)
+    deadline = time.monotonic() + RUN_TIMEOUT
+    while run["status"] in ("queued", "running"):
+        if time.monotonic() > deadline:
+            run = _request_json(
+                f"{api_base_url}/crawler/runs/{run['id']}", method="DELETE"
+            )
+            logger.warning(
+                "Cancelled %s crawl run; saved %s", platform, run.get("saved")
+            )
+            raise TimeoutError(f"{platform} crawl run {run['id']} did not finish")
+        time.sleep(POLL_INTERVAL)
+        run = _request_json(f"{api_base_url}/crawler/runs/{run['id']}")
+
+    saved = run.get("saved") or {}
+    if run["status"] != "succeeded":
+        # Batches committed before the failure stay in the job table.
+        logger.warning("%s crawl run %s; saved %s", platform, run["status"], saved)
+        raise RuntimeError(f"{platform} crawl run {run['status']}: {run.get('error')}")
+    return {"status": run["status"], "progress": run["progress"], **saved}
+
+
 @dag(
     dag_id="job_crawler_pipeline",
     start_date=datetime(2026, 2, 28),
@@ -42,45 +90,17 @@ def _post_json(url: str, payload: dict | None = None) -> list[dict]:
     tags=["crawler", "jobs"],
 )
 def job_crawler_pipeline():
+    # The API writes jobs to the database while crawling; only counts come back.
     @task
-    def run_indeed_crawler() -> list[dict]:
-        api_base_url, crawl_title, crawl_location, crawl_count = _runtime_config()
-        qs = parse.urlencode(
-            {"title": crawl_title, "location": crawl_location, "count": crawl_count}
-        )
-        url = f"{api_base_url}/crawler/indeed?{qs}"
-        return _post_json(url)
+    def save_indeed() -> dict:
+        return _save_crawl("indeed")
 
     @task
-    def run_wttj_crawler() -> list[dict]:
-        api_base_url, crawl_title, crawl_location, crawl_count = _runtime_config()
-        qs = parse.urlencode(
-            {"title": crawl_title, "location": crawl_location, "count": crawl_count}
-        )
-        url = f"{api_base_url}/crawler/wttj?{qs}"
-        return _post_json(url)
+    def save_wttj() -> dict:
+        return _save_crawl("wttj")
 
-    @task
-    def save_indeed(jobs: list[dict]) -> int:
-        api_base_url, _, _, _ = _runtime_config()
-        if not jobs:
-            return 0
-        saved_rows = _post_json(f"{api_base_url}/job/bulk", {"jobs": jobs})
-        return len(saved_rows)
-
-    @task
-    def save_wttj(jobs: list[dict]) -> int:
-        api_base_url, _, _, _ = _runtime_config()
-        if not jobs:
-            return 0
-        saved_rows = _post_json(f"{api_base_url}/job/bulk", {"jobs": jobs})
-        return len(saved_rows)
-
-    indeed_jobs = run_indeed_crawler()
-    wttj_jobs = run_wttj_crawler()
-
-    save_indeed(indeed_jobs)
-    save_wttj(wttj_jobs)
+    save_indeed()
+    save_wttj()
 
 
 job_crawler_pipeline()
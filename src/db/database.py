@@ -1,18 +1,84 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import URL, create_engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 from dotenv import load_dotenv
+from uuid import uuid4
 import os
 
 load_dotenv()
 DB_URL = os.getenv("DB_URL")
-engine = create_engine(DB_URL)
-Session = sessionmaker(bind=engine, autoflush=True, autocommit=False)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in {"1", "true", "yes"}
+# Prepared statements cached per asyncpg connection; 0 behind PgBouncer in
+# transaction mode, which cannot keep them across transactions.
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
 
+_SYNC_DRIVERS = {"postgresql": "psycopg2", "sqlite": "pysqlite"}
+_ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
 
-def get_db():
-    db = Session()
-    try:
+
+def _with_driver(url: str, drivers: dict[str, str]) -> URL:
+    """Point ``url`` at the driver of ``drivers`` for its backend.
+
+    ``DB_URL`` may name any driver, e.g. ``postgresql+psycopg2://``; the sync
+    and async engines each need their own.
+    """
+    url = make_url(url)
+    backend = url.get_backend_name()
+    driver = drivers.get(backend)
+    return url.set(drivername=f"{backend}+{driver}") if driver else url
+
+
+def _pgbouncer_connect_args() -> dict:
+    """asyncpg settings for PgBouncer in transaction mode.
+
+    asyncpg's own statement cache is turned off, and every prepared statement
+    gets a unique name so that server connections shared by other clients
+    never see a name twice.
+    """
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+    }
+
+
+def _async_engine_options(url: URL) -> dict:
+    if url.get_backend_name() == "sqlite":
+        # aiosqlite picks a pool suited to file or in-memory databases.
+        return {"pool_pre_ping": DB_POOL_PRE_PING}
+    options = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    if url.get_dialect().driver == "asyncpg" and DB_STATEMENT_CACHE_SIZE == 0:
+        options["connect_args"] = _pgbouncer_connect_args()
+    return options
+
+
+def async_url(url: str) -> URL:
+    url = _with_driver(url, _ASYNC_DRIVERS)
+    if url.get_dialect().driver == "asyncpg":
+        url = url.update_query_dict(
+            {"prepared_statement_cache_size": str(DB_STATEMENT_CACHE_SIZE)}
+        )
+    return url
+
+
+# Schema creation and migrations run once at startup on the sync engine.
+engine = create_engine(_with_driver(DB_URL, _SYNC_DRIVERS))
+
+_async_url = async_url(DB_URL)
+async_engine = create_async_engine(_async_url, **_async_engine_options(_async_url))
+# Rows stay readable after commit, so responses need no reload round trip.
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
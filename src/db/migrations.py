@@ -0,0 +1,44 @@
+from sqlalchemy import Connection, Engine, text
+
+from src.db.model import Job
+
+_INVALID_INDEX = text(
+    "SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid "
+    "WHERE pg_class.relname = :name AND NOT pg_index.indisvalid"
+)
+
+
+def _create_concurrently(conn: Connection, index) -> None:
+    # A concurrent build that was interrupted leaves an invalid index behind.
+    if conn.execute(_INVALID_INDEX, {"name": index.name}).first():
+        conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{index.name}"'))
+    index.dialect_kwargs["postgresql_concurrently"] = True
+    try:
+        index.create(conn, checkfirst=True)
+    finally:
+        index.dialect_kwargs["postgresql_concurrently"] = False
+
+
+def upgrade(engine: Engine) -> None:
+    """Bring an existing ``job`` table up to date with the indexes on ``Job``.
+
+    ``Base.metadata.create_all`` only creates indexes together with a new
+    table, so databases created before an index was declared need this pass.
+    Indexes are built ``CONCURRENTLY`` outside a transaction, so writes to
+    ``job`` go on meanwhile. Run it once after deploying::
+
+        python -m src.db.migrations
+    """
+    if engine.dialect.name != "postgresql":
+        return
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        for index in Job.__table__.indexes:
+            _create_concurrently(conn, index)
+
+
+if __name__ == "__main__":
+    from src.db.database import engine
+
+    upgrade(engine)
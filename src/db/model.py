@@ -1,4 +1,5 @@
 from sqlalchemy import (
+    DDL,
     Column,
     Enum,
     Text,
@@ -7,8 +8,11 @@ from sqlalchemy import (
     func,
     DateTime,
     UniqueConstraint,
+    Index,
+    event,
+    text,
 )
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, deferred
 import enum
 
 
@@ -24,7 +28,10 @@ class PlatformType(enum.Enum):
 
 class Job(Base):
     __tablename__ = "job"
-    __table_args__ = (UniqueConstraint("platform", "url", "title"),)
+    __table_args__ = (
+        UniqueConstraint("platform", "url", "title"),
+        Index("ix_job_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, nullable=False, index=True)
     platform = Column(Enum(PlatformType))
@@ -35,9 +42,57 @@ class Job(Base):
     contract = Column(String)
     salary = Column(Integer)
     currency = Column(String)
-    job_desc = Column(Text)
-    job_reqs = Column(Text)
+    # Long text is only loaded when accessed or explicitly undeferred.
+    job_desc = deferred(Column(Text), group="text")
+    job_reqs = deferred(Column(Text), group="text")
     exp_level = Column(String)
     edu_level = Column(String)
     published_at = Column(String)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+# Full-text search configuration. "simple" avoids language-specific stemming,
+# which suits postings written in a mix of French and English.
+SEARCH_CONFIG = "simple"
+
+
+def _weighted_vector(column, weight: str):
+    return func.setweight(
+        func.to_tsvector(
+            text(f"'{SEARCH_CONFIG}'"),
+            func.coalesce(column, text("''")),
+        ),
+        text(f"'{weight}'"),
+    )
+
+
+# tsvector over the searchable text. Queries must use this exact expression so
+# Postgres can answer them from the expression index below.
+search_vector = (
+    _weighted_vector(Job.title, "A")
+    .op("||")(_weighted_vector(Job.company, "B"))
+    .op("||")(_weighted_vector(Job.job_reqs, "C"))
+    .op("||")(_weighted_vector(Job.job_desc, "D"))
+)
+
+Index(
+    "ix_job_search_vector", search_vector, postgresql_using="gin"
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_job_title_trgm",
+    Job.title,
+    postgresql_using="gin",
+    postgresql_ops={"title": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_job_location_trgm",
+    Job.location,
+    postgresql_using="gin",
+    postgresql_ops={"location": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,48 @@
+from sqlalchemy import Select, and_, case, func, or_, text
+
+from src.db.model import SEARCH_CONFIG, Job, search_vector
+
+# Rank weights of the SQLite fallback, mirroring the A-D weights of search_vector.
+_FALLBACK_WEIGHTS = (
+    (Job.title, 1.0),
+    (Job.company, 0.4),
+    (Job.job_reqs, 0.2),
+    (Job.job_desc, 0.1),
+)
+
+
+def _postgres_search(q: str):
+    tsquery = func.websearch_to_tsquery(text(f"'{SEARCH_CONFIG}'"), q)
+    return search_vector.op("@@")(tsquery), func.ts_rank_cd(search_vector, tsquery)
+
+
+def _fallback_search(q: str):
+    terms = [term for term in q.split() if term]
+    condition = and_(
+        *(
+            or_(*(column.ilike(f"%{term}%") for column, _ in _FALLBACK_WEIGHTS))
+            for term in terms
+        )
+    )
+    rank = sum(
+        case((column.ilike(f"%{term}%"), weight), else_=0.0)
+        for term in terms
+        for column, weight in _FALLBACK_WEIGHTS
+    )
+    return condition, rank
+
+
+def search(query: Select, q: str, dialect_name: str) -> Select:
+    """Restrict ``query`` to jobs matching ``q`` and order them by relevance.
+
+    Postgres uses the GIN-indexed ``search_vector`` with ``websearch_to_tsquery``
+    syntax; other dialects fall back to a term-wise ``LIKE`` scan so the
+    endpoint stays usable on a local SQLite database.
+    """
+    if dialect_name == "postgresql":
+        condition, rank = _postgres_search(q)
+    else:
+        condition, rank = _fallback_search(q)
+    return query.where(condition).order_by(
+        rank.desc(), Job.created_at.desc(), Job.id.desc()
+    )
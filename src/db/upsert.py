@@ -0,0 +1,136 @@
+import os
+from typing import Iterable, Literal, Sequence
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, undefer_group
+
+from src.db.model import Job
+
+ConflictMode = Literal["ignore", "update"]
+
+# Postgres accepts at most 32767 bind parameters per statement, one per column
+# of each inserted row.
+MAX_CHUNK_SIZE = 32767 // len(Job.__table__.columns)
+DEFAULT_CHUNK_SIZE = min(MAX_CHUNK_SIZE, int(os.getenv("JOB_BULK_CHUNK_SIZE", "500")))
+
+_KEY_COLUMNS = ("platform", "url", "title")
+_UPDATABLE_COLUMNS = tuple(
+    column.name
+    for column in Job.__table__.columns
+    if column.name not in {"id", "created_at", *_KEY_COLUMNS}
+)
+_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def job_key(row) -> tuple:
+    if isinstance(row, dict):
+        return tuple(row[column] for column in _KEY_COLUMNS)
+    return tuple(getattr(row, column) for column in _KEY_COLUMNS)
+
+
+def _chunks(rows: Sequence[dict], size: int) -> Iterable[Sequence[dict]]:
+    size = min(max(1, size), MAX_CHUNK_SIZE)
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+def _insert(dialect_name: str, rows: Sequence[dict]):
+    insert = _INSERTS.get(dialect_name)
+    if insert is None:
+        raise NotImplementedError(f"Bulk upsert is not supported on {dialect_name}")
+    return insert(Job).values(list(rows))
+
+
+def build_upsert(dialect_name: str, rows: Sequence[dict], on_conflict: ConflictMode):
+    """Build one ``INSERT ... ON CONFLICT ... RETURNING`` statement for ``rows``.
+
+    With ``ignore`` conflicting rows are left untouched and are not returned;
+    with ``update`` every non-key column is overwritten and all rows come back.
+    """
+    stmt = _insert(dialect_name, rows)
+    if on_conflict == "update":
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(_KEY_COLUMNS),
+            set_={column: stmt.excluded[column] for column in _UPDATABLE_COLUMNS},
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=list(_KEY_COLUMNS))
+    return stmt.returning(Job).options(undefer_group("text"))
+
+
+def select_existing(keys: Sequence[tuple]):
+    return (
+        select(Job)
+        .where(tuple_(*(getattr(Job, column) for column in _KEY_COLUMNS)).in_(keys))
+        .options(undefer_group("text"))
+    )
+
+
+def dedupe_rows(jobs) -> tuple[list[tuple], list[dict]]:
+    """Return the key of every input job and the first row seen for each key."""
+    keys: list[tuple] = []
+    unique: dict[tuple, dict] = {}
+    for job in jobs:
+        row = job.model_dump() if hasattr(job, "model_dump") else dict(job)
+        key = job_key(row)
+        keys.append(key)
+        unique.setdefault(key, row)
+    return keys, list(unique.values())
+
+
+def upsert_jobs(
+    db: Session,
+    jobs,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    on_conflict: ConflictMode = "ignore",
+) -> list[Job]:
+    """Insert ``jobs`` with one statement per chunk and return rows in input order.
+
+    Rows already present (same platform/url/title) are fetched with a single
+    ``SELECT`` per chunk when ``on_conflict`` is ``ignore``. The caller owns
+    the transaction and must commit.
+    """
+    keys, rows = dedupe_rows(jobs)
+    if not rows:
+        return []
+
+    dialect_name = db.get_bind().dialect.name
+    by_key: dict[tuple, Job] = {}
+    for chunk in _chunks(rows, chunk_size):
+        stmt = build_upsert(dialect_name, chunk, on_conflict)
+        for job in db.scalars(stmt, execution_options={"populate_existing": True}):
+            by_key[job_key(job)] = job
+
+        missing = [job_key(row) for row in chunk if job_key(row) not in by_key]
+        if missing:
+            for job in db.scalars(select_existing(missing)):
+                by_key[job_key(job)] = job
+
+    return [by_key[key] for key in keys]
+
+
+async def insert_new_jobs(
+    db: AsyncSession, jobs, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> int:
+    """Insert the ``jobs`` not stored yet and return how many were inserted.
+
+    Unlike ``upsert_jobs`` nothing is loaded back: each chunk is one
+    ``INSERT ... ON CONFLICT DO NOTHING RETURNING id``. The caller owns the
+    transaction and must commit.
+    """
+    _, rows = dedupe_rows(jobs)
+    dialect_name = db.bind.dialect.name
+    inserted = 0
+    for chunk in _chunks(rows, chunk_size):
+        stmt = (
+            _insert(dialect_name, chunk)
+            .on_conflict_do_nothing(index_elements=list(_KEY_COLUMNS))
+            .returning(Job.id)
+        )
+        inserted += len((await db.scalars(stmt)).all())
+    return inserted
@@ -0,0 +1,295 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Awaitable, Callable, Iterable
+from urllib.parse import urlparse
+from weakref import WeakKeyDictionary, WeakSet
+
+from playwright.async_api import BrowserContext, Page, Request, Response, Route
+
+logger = logging.getLogger(__name__)
+
+ResponsePredicate = Callable[[Response], bool]
+ResponseParser = Callable[[Response], Awaitable[Any]]
+
+
+class ResponseWatcher:
+    """Future resolved by the first page response that matches a predicate.
+
+    The listener is attached as soon as the watcher is created, so creating it
+    before navigation also catches responses fired while the page loads.
+    ``parse`` turns the response into the result; returning ``None`` or raising
+    skips that response and keeps waiting.
+    """
+
+    def __init__(
+        self,
+        page: Page,
+        predicate: ResponsePredicate,
+        parse: ResponseParser | None = None,
+    ) -> None:
+        self.page = page
+        self.started = monotonic()
+        self.elapsed: float | None = None
+        self._predicate = predicate
+        self._parse = parse
+        self._future: asyncio.Future = asyncio.get_running_loop().create_future()
+        page.on("response", self._on_response)
+
+    async def _on_response(self, response: Response) -> None:
+        if self._future.done() or not self._predicate(response):
+            return
+        try:
+            value = await self._parse(response) if self._parse else response
+        except Exception as e:
+            logger.debug("Ignoring response %s: %s", response.url, e)
+            return
+        if value is not None and not self._future.done():
+            self.elapsed = monotonic() - self.started
+            self._future.set_result(value)
+
+    def close(self) -> None:
+        self.page.remove_listener("response", self._on_response)
+
+    async def wait(self, timeout: float) -> Any | None:
+        """Return the parsed response, or ``None`` if none came within ``timeout``."""
+        try:
+            return await asyncio.wait_for(asyncio.shield(self._future), timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self.close()
+
+
+@dataclass(frozen=True)
+class _WatchSpec:
+    predicate: ResponsePredicate
+    parse: ResponseParser | None
+
+
+_watch_specs: dict[str, _WatchSpec] = {}
+_watchers: "WeakKeyDictionary[Page, ResponseWatcher]" = WeakKeyDictionary()
+
+
+def watch_responses(
+    label: str, predicate: ResponsePredicate, parse: ResponseParser | None = None
+) -> None:
+    """Watch responses matching ``predicate`` on every page of ``label`` requests.
+
+    The watcher is started before the crawler navigates; handlers get it with
+    ``response_watcher(context)``.
+    """
+    _watch_specs[label] = _WatchSpec(predicate, parse)
+
+
+def response_watcher(context) -> ResponseWatcher | None:
+    return _watchers.pop(context.page, None)
+
+
+def install_response_watchers(crawler) -> None:
+    """Start the registered watchers right before each navigation.
+
+    Install it after the rate control hook so ``elapsed`` measures the page
+    load, not the wait for a host token.
+    """
+
+    @crawler.pre_navigation_hook
+    async def _start_watcher(context) -> None:
+        stale = _watchers.pop(context.page, None)
+        if stale is not None:
+            stale.close()
+        spec = _watch_specs.get(context.request.label or "")
+        if spec:
+            _watchers[context.page] = ResponseWatcher(
+                context.page, spec.predicate, spec.parse
+            )
+
+
+# Third-party hosts that only serve analytics, ads or session replay.
+TRACKER_DOMAINS = frozenset(
+    {
+        "google-analytics.com",
+        "googletagmanager.com",
+        "googleadservices.com",
+        "doubleclick.net",
+        "facebook.net",
+        "connect.facebook.net",
+        "bat.bing.com",
+        "clarity.ms",
+        "hotjar.com",
+        "hotjar.io",
+        "segment.io",
+        "segment.com",
+        "criteo.com",
+        "criteo.net",
+        "taboola.com",
+        "outbrain.com",
+        "ads.linkedin.com",
+        "analytics.tiktok.com",
+        "sc-static.net",
+        "browser-intake-datadoghq.eu",
+        "browser-intake-datadoghq.com",
+        "sentry.io",
+        "intercom.io",
+        "intercomcdn.com",
+    }
+)
+CACHEABLE_RESOURCE_TYPES = frozenset({"script", "stylesheet", "font", "image"})
+STATIC_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ResourcePolicy:
+    """Which sub-resources the pages of one request label may load.
+
+    ``block_types`` are Playwright resource types to abort; ``allow_types``
+    restricts loading to the listed types when set. URL substrings in
+    ``allow_urls`` always load and those in ``block_urls`` never do.
+    """
+
+    block_types: frozenset[str] = frozenset({"image", "font", "media", "stylesheet"})
+    allow_types: frozenset[str] | None = None
+    block_urls: tuple[str, ...] = ()
+    allow_urls: tuple[str, ...] = ()
+    block_trackers: bool = True
+    cache_static: bool = True
+
+    def allows(self, request: Request, page_host: str | None) -> bool:
+        url = request.url
+        if any(pattern in url for pattern in self.allow_urls):
+            return True
+        if any(pattern in url for pattern in self.block_urls):
+            return False
+        if self.block_trackers and _is_third_party_tracker(url, page_host):
+            return False
+        if request.is_navigation_request():
+            return True
+        resource_type = request.resource_type
+        if self.allow_types is not None and resource_type not in self.allow_types:
+            return False
+        return resource_type not in self.block_types
+
+
+DEFAULT_RESOURCE_POLICY = ResourcePolicy()
+
+
+def _host_matches(host: str, domains: Iterable[str]) -> bool:
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+
+def _is_third_party_tracker(url: str, page_host: str | None) -> bool:
+    host = (urlparse(url).hostname or "").lower()
+    return host != page_host and _host_matches(host, TRACKER_DOMAINS)
+
+
+class StaticResourceCache:
+    """Bounded in-memory cache of static responses shared by all pages.
+
+    Intercepting requests disables Chromium's HTTP cache, so scripts and
+    other static assets are kept here and replayed to later pages.
+    """
+
+    def __init__(self, max_bytes: int = STATIC_CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[int, dict[str, str], bytes]] = (
+            OrderedDict()
+        )
+
+    def get(self, url: str) -> tuple[int, dict[str, str], bytes] | None:
+        entry = self._entries.get(url)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(url)
+        self.hits += 1
+        return entry
+
+    def put(self, url: str, status: int, headers: dict[str, str], body: bytes) -> None:
+        if len(body) > self.max_bytes // 8 or url in self._entries:
+            return
+        # The body is already decoded, so encoding headers no longer apply.
+        headers = {
+            name: value
+            for name, value in headers.items()
+            if name.lower() not in {"content-encoding", "content-length"}
+        }
+        self._entries[url] = (status, headers, body)
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+
+static_cache = StaticResourceCache()
+
+_resource_policies: dict[str, ResourcePolicy] = {}
+_page_labels: "WeakKeyDictionary[Page, str]" = WeakKeyDictionary()
+_routed_contexts: "WeakSet[BrowserContext]" = WeakSet()
+
+
+def block_resources(label: str, policy: ResourcePolicy) -> None:
+    """Use ``policy`` for the pages of ``label`` requests."""
+    _resource_policies[label] = policy
+
+
+def _policy_for(request: Request) -> tuple[ResourcePolicy, str | None]:
+    try:
+        page = request.frame.page
+    except Exception:
+        # Service worker requests have no frame.
+        return DEFAULT_RESOURCE_POLICY, None
+    label = _page_labels.get(page, "")
+    page_host = urlparse(page.url).hostname if page.url.startswith("http") else None
+    return _resource_policies.get(label, DEFAULT_RESOURCE_POLICY), page_host
+
+
+async def _route_request(route: Route, request: Request) -> None:
+    policy, page_host = _policy_for(request)
+    if not policy.allows(request, page_host):
+        await route.abort("blockedbyclient")
+        return
+    if not (
+        policy.cache_static
+        and request.method == "GET"
+        and request.resource_type in CACHEABLE_RESOURCE_TYPES
+    ):
+        await route.continue_()
+        return
+
+    cached = static_cache.get(request.url)
+    if cached is not None:
+        status, headers, body = cached
+        await route.fulfill(status=status, headers=headers, body=body)
+        return
+    try:
+        response = await route.fetch()
+        body = await response.body()
+    except Exception:
+        await route.continue_()
+        return
+    headers = response.headers
+    if response.status == 200 and "no-store" not in headers.get("cache-control", ""):
+        static_cache.put(request.url, response.status, headers, body)
+    await route.fulfill(response=response, body=body)
+
+
+def install_resource_policy(crawler) -> None:
+    """Apply the label resource policies to every page of ``crawler``.
+
+    The route is registered once per browser context, which crawlee reuses
+    across pages, instead of once per page in the request handlers.
+    """
+
+    @crawler.pre_navigation_hook
+    async def _apply_policy(context) -> None:
+        page = context.page
+        _page_labels[page] = context.request.label or ""
+        browser_context = page.context
+        if browser_context not in _routed_contexts:
+            _routed_contexts.add(browser_context)
+            await browser_context.route("**/*", _route_request)
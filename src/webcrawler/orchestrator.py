@@ -0,0 +1,178 @@
+import asyncio
+import logging
+import os
+from contextlib import AsyncExitStack
+from datetime import timedelta
+from typing import AbstractSet, Any, AsyncGenerator, Literal, Mapping, Sequence
+
+from crawlee import ConcurrencySettings, service_locator
+from crawlee.browsers import BrowserPool
+from crawlee.http_clients import ImpitHttpClient
+
+from src.webcrawler.parse_pool import ParsePool, parse_pool
+from src.webcrawler.ratelimit import RateController, rate_controller
+from src.webcrawler.service import (
+    BROWSER_LAUNCH_OPTIONS,
+    crawl_indeed_jobs,
+    crawl_linkedin_jobs,
+    crawl_wttj_jobs,
+)
+from src.webcrawler.seen import JobKey
+from src.webcrawler.stream import STREAM_BUFFER, ItemStream
+
+logger = logging.getLogger(__name__)
+
+CrawlPlatform = Literal["indeed", "wttj", "linkedin"]
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+DEFAULT_BUDGETS: dict[str, int] = {
+    "indeed": _env_int("CRAWL_CONCURRENCY_INDEED", 4),
+    "wttj": _env_int("CRAWL_CONCURRENCY_WTTJ", 3),
+    "linkedin": _env_int("CRAWL_CONCURRENCY_LINKEDIN", 4),
+}
+BROWSER_IDLE_TIMEOUT = timedelta(seconds=_env_int("CRAWL_BROWSER_IDLE_SECONDS", 600))
+
+
+class CrawlOrchestrator:
+    """Browser pool and HTTP client shared by every crawl of the API process."""
+
+    def __init__(
+        self,
+        budgets: Mapping[str, int] | None = None,
+        browser_launch_options: Mapping[str, Any] | None = None,
+        browser_idle_timeout: timedelta = BROWSER_IDLE_TIMEOUT,
+        rate_controller: RateController = rate_controller,
+        parse_pool: ParsePool = parse_pool,
+    ) -> None:
+        self.budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+        self.rate_controller = rate_controller
+        self.parse_pool = parse_pool
+        self.browser_pool = BrowserPool.with_default_plugin(
+            headless=True,
+            browser_launch_options=browser_launch_options or BROWSER_LAUNCH_OPTIONS,
+            browser_inactive_threshold=browser_idle_timeout,
+        )
+        self.http_client = ImpitHttpClient()
+        self._exit_stack: AsyncExitStack | None = None
+
+    async def __aenter__(self) -> "CrawlOrchestrator":
+        # Crawlers skip context managers that are already active, so entering
+        # them here keeps them open across crawler runs.
+        async with AsyncExitStack() as stack:
+            await stack.enter_async_context(service_locator.get_event_manager())
+            await stack.enter_async_context(self.http_client)
+            await stack.enter_async_context(self.browser_pool)
+            self.parse_pool.start()
+            stack.callback(self.parse_pool.shutdown)
+            self._exit_stack = stack.pop_all()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._exit_stack is not None:
+            await self._exit_stack.__aexit__(*exc_info)
+            self._exit_stack = None
+
+    def concurrency(self, platform: CrawlPlatform) -> ConcurrencySettings:
+        # Start low and let crawlee's autoscaling grow towards the budget.
+        return ConcurrencySettings(
+            min_concurrency=1,
+            desired_concurrency=1,
+            max_concurrency=self.budgets[platform],
+        )
+
+    async def crawl(
+        self,
+        platform: CrawlPlatform,
+        title: str,
+        location: str | None = None,
+        count: int = 30,
+        known_jobs: AbstractSet[JobKey] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Crawl one search; postings in ``known_jobs`` are not fetched."""
+        if platform == "indeed":
+            return await crawl_indeed_jobs(
+                title=title,
+                location=location or "",
+                count=count,
+                orchestrator=self,
+                known_jobs=known_jobs,
+            )
+        if platform == "wttj":
+            return await crawl_wttj_jobs(
+                title=title,
+                location=location,
+                count=count,
+                orchestrator=self,
+                known_jobs=known_jobs,
+            )
+        if platform == "linkedin":
+            return await crawl_linkedin_jobs(
+                title=title,
+                location=location or "",
+                count=count,
+                orchestrator=self,
+                known_jobs=known_jobs,
+            )
+        raise ValueError(f"Unsupported crawl platform: {platform}")
+
+    async def stream(
+        self,
+        platform: CrawlPlatform,
+        title: str,
+        location: str | None = None,
+        count: int = 30,
+        known_jobs: AbstractSet[JobKey] | None = None,
+        limit: int | None = None,
+        buffer: int = STREAM_BUFFER,
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """Yield the items of one search as their handlers push them."""
+        items = ItemStream(buffer)
+
+        async def run() -> None:
+            try:
+                with items.bind():
+                    await self.crawl(
+                        platform,
+                        title=title,
+                        location=location,
+                        count=count,
+                        known_jobs=known_jobs,
+                    )
+            finally:
+                items.close()
+
+        task = asyncio.create_task(run())
+        try:
+            async for item in items:
+                yield item
+                if limit is not None and items.count >= limit:
+                    return
+            await task
+        finally:
+            if not task.done():
+                # Handlers blocked on a full buffer must return before the
+                # crawl can finish cancelling.
+                items.discard()
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+    async def crawl_many(
+        self, searches: Sequence[Mapping[str, Any]]
+    ) -> list[list[dict[str, Any]] | BaseException]:
+        """Run several searches at once; failures are returned, not raised."""
+        results = await asyncio.gather(
+            *(self.crawl(**search) for search in searches), return_exceptions=True
+        )
+        for search, result in zip(searches, results):
+            if isinstance(result, BaseException):
+                logger.error(
+                    "Crawl %s %r failed: %s", search["platform"], search["title"], result
+                )
+        return results
@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+# 0 workers parses inline on the event loop; one core is left to the loop.
+PARSE_WORKERS = _env_int("CRAWL_PARSE_WORKERS", min(4, (os.cpu_count() or 1) - 1))
+PARSE_BATCH_SIZE = max(1, _env_int("CRAWL_PARSE_BATCH_SIZE", 8))
+PARSE_BATCH_DELAY = _env_int("CRAWL_PARSE_BATCH_DELAY_MS", 5) / 1000
+
+
+def _import_parsers() -> None:
+    import src.webcrawler.parsers  # noqa: F401
+
+
+def _run_batch(calls: list[tuple[Callable[..., Any], tuple]]) -> list[tuple[bool, Any]]:
+    results: list[tuple[bool, Any]] = []
+    for func, args in calls:
+        try:
+            results.append((True, func(*args)))
+        except Exception as e:
+            results.append((False, e))
+    return results
+
+
+class ParsePool:
+    """Runs CPU-bound page parsing in worker processes.
+
+    Calls made within ``batch_delay`` of each other are sent to a worker
+    together, up to ``batch_size`` per round trip. Parsers must be picklable
+    module-level functions taking and returning plain data. When there are
+    no workers, or the pool breaks, calls run inline instead.
+    """
+
+    def __init__(
+        self,
+        workers: int = PARSE_WORKERS,
+        batch_size: int = PARSE_BATCH_SIZE,
+        batch_delay: float = PARSE_BATCH_DELAY,
+    ) -> None:
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self._executor: ProcessPoolExecutor | None = None
+        self._broken = False
+        self._pending: list[tuple[Callable[..., Any], tuple, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def inline(self) -> bool:
+        return self.workers <= 0 or self._broken
+
+    def start(self) -> None:
+        if self._executor is None and not self.inline:
+            # Spawned workers only import the parser modules, not the app.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_import_parsers,
+            )
+            # Workers are spawned on demand; start them now, off the crawl path.
+            for _ in range(self.workers):
+                self._executor.submit(int)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        if self.inline:
+            return func(*args)
+        self.start()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((func, args, future))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_delay, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._dispatch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(
+        self, batch: list[tuple[Callable[..., Any], tuple, asyncio.Future]]
+    ) -> None:
+        calls = [(func, args) for func, args, _ in batch]
+        executor = self._executor
+        try:
+            if executor is None:
+                raise RuntimeError("parse pool is shut down")
+            results = await asyncio.wrap_future(executor.submit(_run_batch, calls))
+        except BrokenProcessPool as e:
+            # A worker died: parse inline from now on.
+            logger.warning("Parse worker pool broke (%s); parsing inline", e)
+            self._broken = True
+            self.shutdown()
+            results = _run_batch(calls)
+        except Exception as e:
+            # Shut down meanwhile, or unpicklable data: parse this batch inline.
+            logger.warning("Parse batch not run in the worker pool (%s); parsing inline", e)
+            results = _run_batch(calls)
+
+        for (_, _, future), (ok, value) in zip(batch, results):
+            if future.done():
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+
+parse_pool = ParsePool()
@@ -0,0 +1,326 @@
+"""Pure page parsers shared by the crawler handlers.
+
+Everything here takes raw HTML or JSON and returns plain, picklable data, so
+it can run in the parse worker processes as well as inline.
+"""
+
+import html
+import json
+import os
+import re
+from typing import Any, Iterable, NamedTuple
+
+from bs4 import BeautifulSoup
+
+from src.webcrawler.utils import (
+    clean_html,
+    extract_contract_type,
+    extract_education_level,
+    extract_experience_level,
+    extract_requirements_snippet,
+    html_text_sample,
+    normalize_date,
+    normalize_education_level,
+    normalize_experience_level,
+    normalize_linkedin_contract,
+    parse_linkedin_date,
+)
+
+# Overridable to point the crawlers at a local stand-in job board.
+INDEED_BASE_URL = os.getenv("INDEED_BASE_URL", "https://fr.indeed.com")
+LINKEDIN_BASE_URL = os.getenv("LINKEDIN_BASE_URL", "https://www.linkedin.com")
+
+_INDEED_BLOCKED_TITLE_SNIPPETS = ("just a moment", "connexion | comptes indeed")
+_INDEED_BLOCKED_TEXT_SNIPPETS = ("please verify", "moment...")
+_LINKEDIN_BLOCKED_TITLE_SNIPPETS = ("authwall", "sign in")
+_LINKEDIN_BLOCKED_TEXT_SNIPPETS = ("join now to see", "sign in to view", "authwall")
+
+_TITLE_RE = re.compile(r"<title\b[^>]*>(.*?)</title\s*>", re.IGNORECASE | re.DOTALL)
+_LD_JSON_RE = re.compile(
+    r"<script\b[^>]*\btype\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+_CHARSET_RE = re.compile(r"charset=[\"']?([\w-]+)", re.IGNORECASE)
+_LINKEDIN_JOB_ID_RE = re.compile(r'/jobs/view/(?:[^/]+-)?(\d+)')
+_AGO_RE = re.compile(
+    r'\d+[\s\xa0]*(?:minute|hour|heure|day|jour|week|semaine|month|mois)s?(?:[\s\xa0]*ago)?',
+    re.IGNORECASE,
+)
+
+
+class ListPage(NamedTuple):
+    title: str | None
+    blocked: bool
+    job_urls: list[str]
+
+
+def decode_html(body: bytes, content_type: str | None = None) -> str:
+    match = _CHARSET_RE.search(content_type or "")
+    try:
+        return body.decode(match.group(1) if match else "utf-8", errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+
+async def response_html(response) -> str:
+    """Decoded body of a crawlee ``HttpResponse``."""
+    return decode_html(await response.read(), response.headers.get("content-type"))
+
+
+def page_title(page_html: str) -> str | None:
+    match = _TITLE_RE.search(page_html)
+    return html.unescape(match.group(1)).strip() if match else None
+
+
+def is_blocked_page(
+    title: str | None,
+    page_html: str,
+    title_snippets: Iterable[str],
+    text_snippets: Iterable[str],
+) -> bool:
+    title_lower = (title or "").strip().lower()
+    if any(snippet in title_lower for snippet in title_snippets):
+        return True
+
+    # Only tokenize the start of the page instead of extracting all its text.
+    text_sample = html_text_sample(page_html, 500).lower()
+    return any(snippet in text_sample for snippet in text_snippets)
+
+
+def clean(text: str | None) -> str:
+    if not text:
+        return ""
+    return text.strip()
+
+
+# --- Indeed ---
+
+
+def _unique_job_ids(job_tags) -> list[str]:
+    seen: set[str] = set()
+    job_ids: list[str] = []
+    for tag in job_tags:
+        if not tag.has_attr("data-jk"):
+            continue
+        job_id = str(tag["data-jk"]).strip()
+        if job_id and job_id not in seen:
+            seen.add(job_id)
+            job_ids.append(job_id)
+    return job_ids
+
+
+def _find_job_posting(ld_json_blocks) -> dict | None:
+    for block in ld_json_blocks:
+        try:
+            obj = json.loads(block or "")
+        except ValueError:
+            continue
+        for item in obj if isinstance(obj, list) else [obj]:
+            if isinstance(item, dict) and item.get("@type") == "JobPosting":
+                return item
+    return None
+
+
+def is_indeed_blocked(page_html: str, title: str | None = None) -> bool:
+    return is_blocked_page(
+        title or page_title(page_html),
+        page_html,
+        _INDEED_BLOCKED_TITLE_SNIPPETS,
+        _INDEED_BLOCKED_TEXT_SNIPPETS,
+    )
+
+
+def parse_indeed_list(page_html: str) -> ListPage:
+    title = page_title(page_html)
+    if is_indeed_blocked(page_html, title):
+        return ListPage(title, True, [])
+
+    soup = BeautifulSoup(page_html, "lxml")
+    job_ids = _unique_job_ids(soup.select("a[data-jk]"))
+    return ListPage(
+        title, False, [f"{INDEED_BASE_URL}/viewjob?jk={jid}" for jid in job_ids]
+    )
+
+
+def parse_indeed_job(url: str, page_html: str) -> dict[str, Any] | None:
+    """Crawl item of an Indeed detail page, or ``None`` without a JobPosting."""
+    # Scan the raw page for the ld+json blocks; build a DOM only if that fails.
+    job_data = _find_job_posting(_LD_JSON_RE.findall(page_html))
+    if not job_data:
+        soup = BeautifulSoup(page_html, "lxml")
+        job_data = _find_job_posting(
+            script.string
+            for script in soup.find_all("script", type="application/ld+json")
+        )
+    if not job_data:
+        return None
+
+    org = job_data.get("hiringOrganization") or {}
+    loc = job_data.get("jobLocation") or {}
+    addr = loc.get("address") or {} if isinstance(loc, dict) else {}
+    salary = job_data.get("baseSalary") or {}
+    sal_val = salary.get("value") or {}
+
+    desc_text = clean_html(job_data.get("description"))
+    requirements = extract_requirements_snippet(desc_text)
+    published_at = normalize_date(job_data.get("datePosted"))
+    contract = extract_contract_type(job_data.get("employmentType"))
+
+    return {
+        "url": url,
+        "platform": "Indeed",
+        "title": job_data.get("title"),
+        "company": org.get("name"),
+        "location": addr.get("addressLocality") or addr.get("addressRegion"),
+        "contract": contract,
+        "salary": sal_val.get("minValue") or sal_val.get("value"),
+        "currency": salary.get("currency") or "EUR",
+        "job_desc": desc_text,
+        "job_reqs": requirements,
+        "exp_level": extract_experience_level(desc_text) or "Not specified",
+        "edu_level": extract_education_level(desc_text) or "Not specified",
+        "published_at": published_at,
+    }
+
+
+# --- Welcome to the Jungle ---
+
+
+def wttj_job_item(url: str, data: dict) -> dict:
+    """Build the crawl item of a job returned by the WTTJ jobs API."""
+    company = data.get("organization") or {}
+    office = data.get("office") or {}
+    job_desc = clean_html(data.get("description"))
+    job_reqs = clean_html(data.get("profile"))
+    publicated_at = normalize_date(data.get("published_at"))
+    return {
+        "url": url,
+        "platform": "Welcome to the jungle",
+        "title": data.get("name"),
+        "company": company.get("name"),
+        "location": office.get("city"),
+        "contract": data.get("contract_type"),
+        "salary": data.get("salary_min"),
+        "currency": data.get("salary_currency") or "EUR",
+        "exp_level": normalize_experience_level(data.get("experience_level"))
+        or "Not specified",
+        "edu_level": normalize_education_level(data.get("education_level"))
+        or "Not specified",
+        "job_desc": job_desc,
+        "job_reqs": job_reqs,
+        "published_at": publicated_at,
+    }
+
+
+# --- LinkedIn ---
+
+
+def extract_criteria(soup) -> dict:
+    """Extract seniority level and employment type from the job criteria list.
+
+    Tries multiple selector variants to handle LinkedIn's changing class names.
+    """
+    result = {'seniority_level': '', 'employment_type': ''}
+
+    # Primary selector used by the guest API response
+    items = soup.select('li.description__job-criteria-item')
+    # Fallback: any li whose class contains "criteria"
+    if not items:
+        items = soup.select('li[class*="criteria"]')
+
+    for item in items:
+        # h3 subheader label (e.g. "Seniority level", "Employment type")
+        h3 = item.select_one('h3, h3[class*="subheader"]')
+        # span with the actual value
+        span = item.select_one('span[class*="criteria-text"], span[class*="criteria"]')
+        if not h3 or not span:
+            continue
+        header = clean(h3.get_text()).lower()
+        value = clean(span.get_text())
+        if any(k in header for k in ('seniority', 'séniorité', 'niveau')):
+            result['seniority_level'] = value
+        elif any(k in header for k in ('employment', "type d’emploi", 'type de contrat', 'contrat', 'emploi')):
+            result['employment_type'] = value
+
+    return result
+
+
+def is_linkedin_blocked(page_html: str, title: str | None = None) -> bool:
+    return is_blocked_page(
+        title or page_title(page_html),
+        page_html,
+        _LINKEDIN_BLOCKED_TITLE_SNIPPETS,
+        _LINKEDIN_BLOCKED_TEXT_SNIPPETS,
+    )
+
+
+def parse_linkedin_list(page_html: str) -> ListPage:
+    title = page_title(page_html)
+    if is_linkedin_blocked(page_html, title):
+        return ListPage(title, True, [])
+
+    soup = BeautifulSoup(page_html, "lxml")
+    seen, unique_urls = set(), []
+    for a_tag in soup.select('a[href*="/jobs/view/"]'):
+        match = _LINKEDIN_JOB_ID_RE.search(a_tag.get('href', ''))
+        if match:
+            url = f"{LINKEDIN_BASE_URL}/jobs-guest/jobs/api/jobPosting/{match.group(1)}"
+            if url not in seen:
+                seen.add(url)
+                unique_urls.append(url)
+    return ListPage(title, False, unique_urls)
+
+
+def parse_linkedin_job(url: str, page_html: str) -> dict[str, Any] | None:
+    """Crawl item of a LinkedIn guest job posting, or ``None`` without a title."""
+    soup = BeautifulSoup(page_html, "lxml")
+
+    # --- Core fields via CSS selectors ---
+    title_tag = soup.select_one(
+        'h2.top-card-layout__title, h1.top-card-layout__title, h1'
+    )
+    company_tag = soup.select_one(
+        'a.topcard__org-name-link, .topcard__flavor a, '
+        '.job-details-jobs-unified-top-card__company-name a'
+    )
+    # Location appears as the first bullet-separated flavour text after company
+    location_tag = soup.select_one(
+        'span.topcard__flavor--bullet, '
+        '.job-details-jobs-unified-top-card__bullet, '
+        '.jobs-unified-top-card__bullet'
+    )
+    _time_text = soup.find(string=_AGO_RE)
+
+    job_title = clean(title_tag.get_text() if title_tag else None)
+    if not job_title:
+        return None
+    company_name = clean(company_tag.get_text() if company_tag else None)
+    location = clean(location_tag.get_text() if location_tag else None)
+    time_of_posting = parse_linkedin_date(str(_time_text) if _time_text else None)
+
+    # --- Criteria (seniority / employment type) ---
+    criteria = extract_criteria(soup)
+
+    # --- Description ---
+    desc_tag = soup.select_one('div.show-more-less-html__markup')
+    desc_text = desc_tag.get_text(separator='\n') if desc_tag else ''
+
+    return {
+        "url": url,
+        "platform": "Linkedin",
+        "title": job_title,
+        "company": company_name,
+        "location": location,
+        "contract": normalize_linkedin_contract(criteria['employment_type']),
+        "salary": None,
+        "currency": "EUR",
+        "job_desc": desc_text,
+        "job_reqs": extract_requirements_snippet(desc_text),
+        "exp_level": (
+            extract_experience_level(criteria['seniority_level'])
+            or extract_experience_level(desc_text)
+            or "Not specified"
+        ),
+        "edu_level": extract_education_level(desc_text) or "Not specified",
+        "published_at": time_of_posting,
+    }
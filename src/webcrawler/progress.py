@@ -0,0 +1,40 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+_current_progress: ContextVar["CrawlProgress | None"] = ContextVar(
+    "_current_progress", default=None
+)
+
+
+class CrawlProgress:
+    """Pages fetched and errors hit by a running crawl, for status reports.
+
+    Crawlee handlers count a page once it is handled and an error for each
+    failed attempt; the WTTJ API client counts each response it gets back.
+    """
+
+    def __init__(self) -> None:
+        self.pages = 0
+        self.errors = 0
+
+    @contextmanager
+    def bind(self) -> Iterator["CrawlProgress"]:
+        """Count the pages of crawls started in this context."""
+        token = _current_progress.set(self)
+        try:
+            yield self
+        finally:
+            _current_progress.reset(token)
+
+
+def count_page() -> None:
+    progress = _current_progress.get()
+    if progress is not None:
+        progress.pages += 1
+
+
+def count_error() -> None:
+    progress = _current_progress.get()
+    if progress is not None:
+        progress.errors += 1
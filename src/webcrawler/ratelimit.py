@@ -0,0 +1,234 @@
+import asyncio
+import logging
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Awaitable, Callable, Mapping
+from urllib.parse import urlparse
+
+from crawlee import Request
+from crawlee.errors import SessionError
+
+from src.webcrawler.progress import count_error, count_page
+
+logger = logging.getLogger(__name__)
+
+BLOCK_STATUS_CODES = frozenset({403, 429})
+_MAX_COOLDOWN = 120.0
+
+
+@dataclass(frozen=True)
+class DomainPolicy:
+    rate: float = 1.0  # initial requests per second
+    min_rate: float = 0.1
+    max_rate: float = 5.0
+    burst: int = 2
+    increase: float = 0.1  # added to the rate after each healthy response
+    decrease: float = 0.5  # rate multiplier after a block
+    cooldown: float = 5.0  # pause after a block, grows with consecutive blocks
+
+
+DEFAULT_POLICIES: dict[str, DomainPolicy] = {
+    "fr.indeed.com": DomainPolicy(rate=0.5, max_rate=2.0),
+    "www.linkedin.com": DomainPolicy(rate=0.5, max_rate=2.0),
+    "www.welcometothejungle.com": DomainPolicy(rate=1.0, max_rate=4.0),
+    "api.welcometothejungle.com": DomainPolicy(rate=2.0, max_rate=10.0, burst=4),
+}
+
+
+class DomainThrottle:
+    """Token bucket for one host whose refill rate adapts to the responses.
+
+    The rate grows additively while responses are healthy and is cut
+    multiplicatively, with a growing cooldown, when the host blocks us.
+    """
+
+    def __init__(self, policy: DomainPolicy) -> None:
+        self.policy = policy
+        self.rate = policy.rate
+        self.successes = 0
+        self.blocks = 0
+        self._consecutive_blocks = 0
+        self._tokens = float(policy.burst)
+        self._updated = monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            float(self.policy.burst), self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def record_success(self) -> None:
+        self._refill(monotonic())
+        self.successes += 1
+        self._consecutive_blocks = 0
+        self.rate = min(self.policy.max_rate, self.rate + self.policy.increase)
+
+    def record_block(self) -> None:
+        now = monotonic()
+        self._refill(now)
+        self.blocks += 1
+        self._consecutive_blocks += 1
+        self.rate = max(self.policy.min_rate, self.rate * self.policy.decrease)
+        self._tokens = 0.0
+        self._paused_until = now + min(
+            _MAX_COOLDOWN, self.policy.cooldown * self._consecutive_blocks
+        )
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "rate": round(self.rate, 3),
+            "successes": self.successes,
+            "blocks": self.blocks,
+            "paused_for": round(max(0.0, self._paused_until - monotonic()), 1),
+        }
+
+
+class RateController:
+    """Per-host throttles shared by every crawler of the process."""
+
+    def __init__(
+        self,
+        policies: Mapping[str, DomainPolicy] | None = None,
+        default_policy: DomainPolicy = DomainPolicy(),
+    ) -> None:
+        self.policies = dict(DEFAULT_POLICIES if policies is None else policies)
+        self.default_policy = default_policy
+        self._throttles: dict[str, DomainThrottle] = {}
+
+    def throttle(self, url: str) -> DomainThrottle:
+        host = urlparse(url).hostname or url
+        if host not in self._throttles:
+            policy = self.policies.get(host, self.default_policy)
+            self._throttles[host] = DomainThrottle(policy)
+        return self._throttles[host]
+
+    async def acquire(self, url: str) -> None:
+        await self.throttle(url).acquire()
+
+    def record(self, url: str, status: int | None = None, blocked: bool = False) -> None:
+        throttle = self.throttle(url)
+        if blocked or status in BLOCK_STATUS_CODES:
+            throttle.record_block()
+            logger.warning(
+                "Blocked on %s (status=%s); rate lowered to %.2f req/s",
+                urlparse(url).hostname,
+                status,
+                throttle.rate,
+            )
+        elif status is None or status < 400:
+            throttle.record_success()
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        return {host: throttle.snapshot() for host, throttle in self._throttles.items()}
+
+
+rate_controller = RateController()
+
+MAX_BLOCK_RETRIES = 3
+
+_blocked: ContextVar[bool] = ContextVar("_blocked", default=False)
+
+
+def report_blocked() -> None:
+    """Flag the page being handled as an anti-bot page for the rate controller."""
+    _blocked.set(True)
+
+
+async def retry_blocked(
+    context,
+    headers: Mapping[str, str] | None = None,
+    max_retries: int = MAX_BLOCK_RETRIES,
+) -> bool:
+    """Report an anti-bot page and queue its request again.
+
+    Returns ``False`` without queueing once the request was retried
+    ``max_retries`` times, or its ``max_block_retries`` user data.
+    """
+    report_blocked()
+    request = context.request
+    user_data = dict(request.user_data or {})
+    retries = int(user_data.get("block_retries", 0))
+    max_retries = int(user_data.get("max_block_retries", max_retries))
+    if retries >= max_retries:
+        context.log.error(
+            "Reached block retry limit (%s) for %s; giving up.", max_retries, request.url
+        )
+        return False
+    context.log.warning(
+        "Detected anti-bot page on %s. Retrying %s/%s.",
+        request.url,
+        retries + 1,
+        max_retries,
+    )
+    await context.add_requests(
+        [
+            Request.from_url(
+                request.url,
+                label=request.label,
+                user_data={**user_data, "block_retries": retries + 1},
+                headers=headers,
+                always_enqueue=True,
+            )
+        ]
+    )
+    return True
+
+
+def _status_code(context) -> int | None:
+    response = getattr(context, "http_response", None) or getattr(
+        context, "response", None
+    )
+    status = getattr(response, "status_code", None) or getattr(response, "status", None)
+    return status if isinstance(status, int) else None
+
+
+def install_rate_control(crawler, controller: RateController = rate_controller) -> None:
+    """Wait for a host token before each navigation and record failed fetches."""
+
+    @crawler.pre_navigation_hook
+    async def _wait_for_token(context) -> None:
+        await controller.acquire(context.request.url)
+
+    @crawler.error_handler
+    async def _record_error(context, error: Exception) -> None:
+        count_error()
+        # Crawlee raises SessionError when it assumes a blocking status code.
+        status = getattr(error, "status_code", None)
+        if isinstance(error, SessionError) or status in BLOCK_STATUS_CODES:
+            controller.record(context.request.url, status=status, blocked=True)
+
+
+def with_rate_feedback(
+    handler: Callable[[Any], Awaitable[None]],
+    controller: RateController = rate_controller,
+) -> Callable[[Any], Awaitable[None]]:
+    """Wrap a request handler so each handled page feeds the rate controller."""
+
+    async def handle(context) -> None:
+        token = _blocked.set(False)
+        try:
+            await handler(context)
+            count_page()
+            controller.record(
+                context.request.url, status=_status_code(context), blocked=_blocked.get()
+            )
+        finally:
+            _blocked.reset(token)
+
+    return handle
@@ -1,8 +1,14 @@
 from crawlee.router import Router
-from crawlee.crawlers import PlaywrightCrawlingContext, BeautifulSoupCrawlingContext
+from crawlee.crawlers import (
+    BeautifulSoupCrawlingContext,
+    HttpCrawlingContext,
+    PlaywrightCrawlingContext,
+)
 from typing import Union
 
-router = Router[Union[PlaywrightCrawlingContext, BeautifulSoupCrawlingContext]]()
+router = Router[
+    Union[PlaywrightCrawlingContext, BeautifulSoupCrawlingContext, HttpCrawlingContext]
+]()
 
 
 @router.default_handler
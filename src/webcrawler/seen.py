@@ -0,0 +1,91 @@
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import AbstractSet, Iterable, Iterator
+from urllib.parse import urlparse
+
+_INDEED_JK_RE = re.compile(r"[?&]jk=([0-9A-Za-z]+)")
+_LINKEDIN_ID_RE = re.compile(r"/(?:jobs/view/(?:[^/?#]+-)?|jobPosting/)(\d+)")
+_WTTJ_SLUG_RE = re.compile(r"/companies/([^/?#]+)/jobs/([^/?#]+)")
+
+JobKey = tuple[str, str]
+
+_current_index: ContextVar["SeenJobIndex | None"] = ContextVar(
+    "_current_index", default=None
+)
+
+
+def job_key(url: str) -> JobKey | None:
+    """Return ``(platform, id)`` identifying the posting behind ``url``.
+
+    Uses the Indeed ``jk``, the LinkedIn job id and the WTTJ company/job slugs,
+    so list links and stored detail URLs of the same posting share one key.
+    """
+    if not url:
+        return None
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    if "indeed." in host:
+        match = _INDEED_JK_RE.search(url)
+        return ("indeed", match.group(1)) if match else None
+    if "linkedin." in host:
+        match = _LINKEDIN_ID_RE.search(parsed.path)
+        return ("linkedin", match.group(1)) if match else None
+    if "welcometothejungle." in host:
+        match = _WTTJ_SLUG_RE.search(parsed.path)
+        return ("wttj", "/".join(match.groups())) if match else None
+    # Other hosts (e.g. a local stand-in board) may carry the id in the query.
+    path = parsed.path.rstrip("/") + (f"?{parsed.query}" if parsed.query else "")
+    return (host, path) if host else None
+
+
+class SeenJobIndex:
+    """Postings one crawl run skips: those stored and those it queued itself.
+
+    ``stored`` holds the keys of the ``job`` table rows and is only read.
+    List handlers ``claim`` the postings they enqueue, so overlapping pages
+    of the same run do not fetch them twice.
+    """
+
+    def __init__(self, stored: AbstractSet[JobKey] = frozenset()) -> None:
+        self.stored = stored
+        self.queued: set[JobKey] = set()
+
+    def is_stored(self, url: str) -> bool:
+        return job_key(url) in self.stored
+
+    def is_known(self, url: str) -> bool:
+        key = job_key(url)
+        return key in self.stored or key in self.queued
+
+    def filter_new(self, urls: Iterable[str]) -> list[str]:
+        return [url for url in urls if not self.is_known(url)]
+
+    def claim(self, urls: Iterable[str]) -> list[str]:
+        """Return the ``urls`` not known yet and count them as queued."""
+        new = []
+        for url in urls:
+            key = job_key(url)
+            if key is None:
+                new.append(url)
+            elif key not in self.stored and key not in self.queued:
+                self.queued.add(key)
+                new.append(url)
+        return new
+
+    @contextmanager
+    def bind(self) -> Iterator["SeenJobIndex"]:
+        """Make the index visible to the handlers of crawls run in this context."""
+        token = _current_index.set(self)
+        try:
+            yield self
+        finally:
+            _current_index.reset(token)
+
+
+def job_keys(urls: Iterable[str]) -> set[JobKey]:
+    return {key for key in map(job_key, urls) if key}
+
+
+def seen_index() -> SeenJobIndex | None:
+    return _current_index.get()
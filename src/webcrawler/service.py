@@ -1,17 +1,48 @@
+from __future__ import annotations
+
+import logging
+import os
 from datetime import timedelta
 from math import ceil
-from typing import Any
+from typing import TYPE_CHECKING, AbstractSet, Any, Hashable, Literal
 from urllib.parse import urlencode
 from uuid import uuid4
 
 from crawlee import ConcurrencySettings, Request
 from crawlee.configuration import Configuration
-from crawlee.crawlers import BeautifulSoupCrawler, PlaywrightCrawler
-from crawlee.storages import RequestQueue
+from crawlee.crawlers import BasicCrawler, HttpCrawler, PlaywrightCrawler
+from crawlee.http_clients import ImpitHttpClient
+from crawlee.storage_clients import MemoryStorageClient
 
 import src.webcrawler.indeed_crawler
+import src.webcrawler.linkedIn_crawler
 import src.webcrawler.wttj_crawler
+from src.webcrawler.browser import (
+    ResourcePolicy,
+    block_resources,
+    install_resource_policy,
+    install_response_watchers,
+)
+from src.webcrawler.parsers import INDEED_BASE_URL, LINKEDIN_BASE_URL
+from src.webcrawler.ratelimit import (
+    RateController,
+    install_rate_control,
+    rate_controller,
+    with_rate_feedback,
+)
 from src.webcrawler.rooter import router
+from src.webcrawler.seen import JobKey, SeenJobIndex
+from src.webcrawler.target import CrawlTarget
+from src.webcrawler.wttj_api import SITE_URL as WTTJ_SITE_URL
+from src.webcrawler.wttj_api import WttjApiError, crawl_wttj_api
+
+if TYPE_CHECKING:
+    from src.webcrawler.orchestrator import CrawlOrchestrator
+
+logger = logging.getLogger(__name__)
+
+WttjBackend = Literal["auto", "api", "browser"]
+WTTJ_BACKEND = os.getenv("WTTJ_BACKEND", "auto")
 
 _HEADERS = {
     "User-Agent": (
@@ -23,9 +54,52 @@ _HEADERS = {
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
 }
 
+INDEED_PAGE_STEP = 10  # start= increment between Indeed result pages
+LINKEDIN_PAGE_SIZE = 10  # jobs per guest search page
 
-def _run_queue_alias(prefix: str) -> str:
-    return f"{prefix}-{uuid4().hex}"
+BROWSER_LAUNCH_OPTIONS: dict[str, Any] = {
+    "chromium_sandbox": False,
+    "args": ["--no-sandbox", "--disable-setuid-sandbox"],
+}
+
+# List pages need their scripts to run the search; job pages only need the
+# document to call the jobs API from the site's origin.
+WTTJ_RESOURCE_POLICIES: dict[str, ResourcePolicy] = {
+    "WTTJ_List": ResourcePolicy(),
+    "WTTJ_Job": ResourcePolicy(
+        allow_types=frozenset({"document", "fetch", "xhr"}), cache_static=False
+    ),
+}
+
+
+class RunStorageClient(MemoryStorageClient):
+    """In-memory storages private to one crawler run."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._cache_key = uuid4().hex
+
+    def get_storage_client_cache_key(self, configuration: Configuration) -> Hashable:
+        return self._cache_key
+
+
+async def _run_crawler(
+    crawler: BasicCrawler,
+    requests: list[Request],
+    known_jobs: AbstractSet[JobKey] | None = None,
+) -> list[dict[str, Any]]:
+    """Run ``crawler`` and return the items it pushed, then drop its storages."""
+    try:
+        with SeenJobIndex(known_jobs or frozenset()).bind():
+            await crawler.run(requests)
+        return _extract_items(await crawler.get_data())
+    finally:
+        for storage in (
+            await crawler.get_dataset(),
+            await crawler.get_request_manager(),
+            await crawler.get_key_value_store(),
+        ):
+            await storage.drop()
 
 
 def _extract_items(result: Any) -> list[dict[str, Any]]:
@@ -42,94 +116,212 @@ def _latest_first(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
 
 
 async def crawl_indeed_jobs(
-    title: str = "data", location: str = "France"
+    title: str = "data",
+    location: str = "France",
+    count: int = 30,
+    max_pages: int | None = None,
+    orchestrator: CrawlOrchestrator | None = None,
+    known_jobs: AbstractSet[JobKey] | None = None,
 ) -> list[dict[str, Any]]:
-    request_queue = await RequestQueue.open(alias=_run_queue_alias("indeed"))
+    """Crawl the Indeed results of a search, newest first."""
+    target_count = max(1, count)
+    user_data = {"max_jobs": target_count}
+    controller = orchestrator.rate_controller if orchestrator else rate_controller
 
-    crawler = BeautifulSoupCrawler(
-        request_handler=router,
-        request_manager=request_queue,
-        concurrency_settings=ConcurrencySettings(
-            max_concurrency=1, desired_concurrency=1
+    # Handlers parse the raw body themselves; detail pages never need a DOM.
+    crawler = HttpCrawler(
+        request_handler=with_rate_feedback(router, controller),
+        storage_client=RunStorageClient(),
+        concurrency_settings=(
+            orchestrator.concurrency("indeed")
+            if orchestrator
+            else ConcurrencySettings(max_concurrency=1, desired_concurrency=1)
         ),
+        http_client=orchestrator.http_client if orchestrator else None,
         request_handler_timeout=timedelta(seconds=600),
         ignore_http_error_status_codes={403, 404},
     )
+    install_rate_control(crawler, controller)
 
-    requests: list[Request] = []
-
-    params = {
-        "q": title,
-        "l": location,
-        "start": 0,
-        "sort": "date",
-    }
-    start_url = f"https://fr.indeed.com/jobs?{urlencode(params)}"
-    requests.append(
+    pages = ceil(target_count / INDEED_PAGE_STEP)
+    if max_pages is not None:
+        pages = max(1, min(max_pages, pages))
+    requests = [
         Request.from_url(
-            url=start_url,
+            url=f"{INDEED_BASE_URL}/jobs?"
+            + urlencode({"q": title, "l": location, "start": start, "sort": "date"}),
             label="Indeed_List",
             headers=_HEADERS,
+            user_data=user_data,
         )
-    )
-
-    await crawler.run(requests)
-    data_page = await crawler.get_data()
-    items = _extract_items(data_page)
-    indeed_items = [
-        item for item in items if str(item.get("platform", "")).strip().lower() == "indeed"
+        for start in range(0, pages * INDEED_PAGE_STEP, INDEED_PAGE_STEP)
     ]
-    return _latest_first(indeed_items)
 
+    items = await _run_crawler(crawler, requests, known_jobs)
+    return _latest_first(items)[:target_count]
 
-async def crawl_wttj_jobs(
-    title: str = "data", location: str | None = None, count: int = 30
+
+async def crawl_linkedin_jobs(
+    title: str = "data",
+    location: str = "France",
+    count: int = 30,
+    orchestrator: CrawlOrchestrator | None = None,
+    known_jobs: AbstractSet[JobKey] | None = None,
 ) -> list[dict[str, Any]]:
+    """Crawl LinkedIn through its guest jobs API."""
     target_count = max(1, count)
-    page_size = 15
-    pages = ceil(target_count / page_size)
-    search_query = title if not location else f"{title} {location}"
+    controller = orchestrator.rate_controller if orchestrator else rate_controller
 
-    request_queue = await RequestQueue.open(alias=_run_queue_alias("wttj"))
+    crawler = HttpCrawler(
+        request_handler=with_rate_feedback(router, controller),
+        storage_client=RunStorageClient(),
+        concurrency_settings=(
+            orchestrator.concurrency("linkedin")
+            if orchestrator
+            else ConcurrencySettings(max_concurrency=2, desired_concurrency=2)
+        ),
+        http_client=orchestrator.http_client if orchestrator else None,
+        request_handler_timeout=timedelta(seconds=120),
+        ignore_http_error_status_codes={403, 404},
+    )
+    install_rate_control(crawler, controller)
 
+    requests = [
+        Request.from_url(
+            url=(
+                f"{LINKEDIN_BASE_URL}/jobs-guest/jobs/api/seeMoreJobPostings/search?"
+                + urlencode({"keywords": title, "location": location, "start": start})
+            ),
+            label="Linkedin_List",
+            headers=_HEADERS,
+        )
+        for start in range(0, target_count, LINKEDIN_PAGE_SIZE)
+    ]
+
+    items = await _run_crawler(crawler, requests, known_jobs)
+    return _latest_first(items)[:target_count]
+
+
+async def _crawl_wttj_browser(
+    requests: list[Request],
+    orchestrator: CrawlOrchestrator | None,
+    controller: RateController,
+    count: int | None = None,
+    known_jobs: AbstractSet[JobKey] | None = None,
+    resource_policies: dict[str, ResourcePolicy] = WTTJ_RESOURCE_POLICIES,
+) -> list[dict[str, Any]]:
+    for label, policy in resource_policies.items():
+        block_resources(label, policy)
+
+    # A shared pool cannot be combined with per-crawler launch options.
+    browser_options: dict[str, Any] = (
+        {"browser_pool": orchestrator.browser_pool}
+        if orchestrator
+        else {"browser_launch_options": BROWSER_LAUNCH_OPTIONS}
+    )
     crawler = PlaywrightCrawler(
-        request_handler=router,
-        request_manager=request_queue,
+        request_handler=with_rate_feedback(router, controller),
+        storage_client=RunStorageClient(),
         request_handler_timeout=timedelta(seconds=120),
-        browser_launch_options={
-            "chromium_sandbox": False,
-            "args": ["--no-sandbox", "--disable-setuid-sandbox"],
-        },
-        concurrency_settings=ConcurrencySettings(
-            min_concurrency=1,
-            desired_concurrency=1,
-            max_concurrency=1,
+        concurrency_settings=(
+            orchestrator.concurrency("wttj")
+            if orchestrator
+            else ConcurrencySettings(
+                min_concurrency=1,
+                desired_concurrency=1,
+                max_concurrency=1,
+            )
         ),
+        **browser_options,
+        # List pages are ready once the search response arrives, which the
+        # WTTJ_List watcher waits for; the full load event is not needed.
+        goto_options={"wait_until": "domcontentloaded"},
         configuration=Configuration(
             disable_browser_sandbox=True,
             max_used_cpu_ratio=1.0,
             max_event_loop_delay=timedelta(milliseconds=500),
         ),
     )
+    install_rate_control(crawler, controller)
+    install_response_watchers(crawler)
+    install_resource_policy(crawler)
 
-    requests: list[Request] = []
-    for page in range(1, pages + 1):
-        params = {"query": search_query, "page": page, "sortBy": "mostRecent"}
-        start_url = "https://www.welcometothejungle.com/fr/jobs" f"?{urlencode(params)}"
-        requests.append(
-            Request.from_url(
-                url=start_url,
-                label="WTTJ_List",
-                headers=_HEADERS,
-            )
+    if count is None:
+        return await _run_crawler(crawler, requests, known_jobs)
+    # Stop as soon as ``count`` jobs are in instead of draining the queue.
+    target = CrawlTarget(
+        count, on_reached=lambda: crawler.stop(f"collected {count} WTTJ jobs")
+    )
+    with target.bind():
+        return await _run_crawler(crawler, requests, known_jobs)
+
+
+async def _crawl_wttj_http(
+    orchestrator: CrawlOrchestrator | None,
+    controller: RateController,
+    **search: Any,
+) -> tuple[list[dict[str, Any]], list[str]]:
+    if orchestrator:
+        return await crawl_wttj_api(
+            orchestrator.http_client, controller=controller, **search
         )
+    async with ImpitHttpClient() as http_client:
+        return await crawl_wttj_api(http_client, controller=controller, **search)
+
 
-    await crawler.run(requests)
-    data_page = await crawler.get_data()
-    items = _extract_items(data_page)
-    wttj_items = [
-        item
-        for item in items
-        if str(item.get("platform", "")).strip().lower() in {"welcome to the jungle", "wttj"}
+async def crawl_wttj_jobs(
+    title: str = "data",
+    location: str | None = None,
+    count: int = 30,
+    orchestrator: CrawlOrchestrator | None = None,
+    known_jobs: AbstractSet[JobKey] | None = None,
+    backend: WttjBackend = WTTJ_BACKEND,
+) -> list[dict[str, Any]]:
+    """Crawl WTTJ through its JSON APIs, using Chromium only as a fallback."""
+    target_count = max(1, count)
+    controller = orchestrator.rate_controller if orchestrator else rate_controller
+
+    if backend != "browser":
+        try:
+            items, failed_urls = await _crawl_wttj_http(
+                orchestrator,
+                controller,
+                title=title,
+                location=location,
+                count=target_count,
+                known_jobs=known_jobs,
+            )
+        except WttjApiError as e:
+            if backend == "api":
+                raise
+            logger.warning("WTTJ API unavailable (%s); using the browser crawler", e)
+        else:
+            if failed_urls and backend == "auto":
+                retried = await _crawl_wttj_browser(
+                    [Request.from_url(url, label="WTTJ_Job") for url in failed_urls],
+                    orchestrator,
+                    controller,
+                    count=max(1, target_count - len(items)),
+                )
+                items += [item for item in retried if item.get("url") in failed_urls]
+            return _latest_first(items)[:target_count]
+
+    page_size = 15
+    pages = ceil(target_count / page_size)
+    search_query = title if not location else f"{title} {location}"
+
+    # The list handler requests the next pages only while jobs are missing.
+    params = {"query": search_query, "page": 1, "sortBy": "mostRecent"}
+    requests = [
+        Request.from_url(
+            url=f"{WTTJ_SITE_URL}/fr/jobs?{urlencode(params)}",
+            label="WTTJ_List",
+            headers=_HEADERS,
+            user_data={"page": 1, "max_pages": pages},
+        )
     ]
+
+    wttj_items = await _crawl_wttj_browser(
+        requests, orchestrator, controller, count=target_count, known_jobs=known_jobs
+    )
     return _latest_first(wttj_items)[:target_count]
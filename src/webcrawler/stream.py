@@ -0,0 +1,86 @@
+import asyncio
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Iterator
+
+STREAM_BUFFER = max(1, int(os.getenv("CRAWL_STREAM_BUFFER", "32")))
+
+_current_stream: ContextVar["ItemStream | None"] = ContextVar(
+    "_current_stream", default=None
+)
+
+
+class ItemStream:
+    """Bounded queue of crawl items consumed while the crawl is running.
+
+    Handlers block on ``put`` once ``maxsize`` items are waiting, so a slow
+    consumer slows the crawl down instead of letting items pile up.
+    """
+
+    _END = object()
+
+    def __init__(self, maxsize: int = STREAM_BUFFER) -> None:
+        self._queue: asyncio.Queue[Any] = asyncio.Queue(maxsize)
+        self._closed = False
+        self._discarded = False
+        self.count = 0
+
+    async def put(self, item: dict[str, Any]) -> None:
+        if self._discarded:
+            return
+        await self._queue.put(item)
+        if self._discarded:
+            # Each get wakes one blocked put, which drains again in turn.
+            self._drain()
+
+    def close(self) -> None:
+        """Mark the end of the crawl, after the items already queued.
+
+        Never waits: when the buffer is full the consumer stops once it has
+        drained it, and a consumer that went away never reads it at all.
+        """
+        self._closed = True
+        try:
+            self._queue.put_nowait(self._END)
+        except asyncio.QueueFull:
+            pass
+
+    def discard(self) -> None:
+        """The consumer went away: drop the queued items and stop blocking puts."""
+        self._discarded = True
+        self._drain()
+
+    def _drain(self) -> None:
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+    @contextmanager
+    def bind(self) -> Iterator["ItemStream"]:
+        """Route the items of crawls started in this context to the stream."""
+        token = _current_stream.set(self)
+        try:
+            yield self
+        finally:
+            _current_stream.reset(token)
+
+    async def __aiter__(self) -> AsyncIterator[dict[str, Any]]:
+        while not (self._closed and self._queue.empty()):
+            item = await self._queue.get()
+            if item is self._END:
+                return
+            self.count += 1
+            yield item
+
+
+async def emit(item: dict[str, Any]) -> bool:
+    """Send ``item`` to the stream of the running crawl, if there is one.
+
+    Returns False when the crawl is not streamed and the caller should keep
+    the item itself.
+    """
+    stream = _current_stream.get()
+    if stream is None:
+        return False
+    await stream.put(item)
+    return True
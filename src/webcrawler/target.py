@@ -0,0 +1,67 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator
+
+_current_target: ContextVar["CrawlTarget | None"] = ContextVar(
+    "_current_target", default=None
+)
+
+
+class CrawlTarget:
+    """Number of items a crawl is after, shared by its handlers.
+
+    List handlers ``reserve`` detail requests only while the target is not
+    covered yet, and detail handlers ``accept`` their item before pushing it.
+    Once ``count`` items are accepted, ``on_reached`` is called so the crawl
+    can stop instead of working through the requests still queued.
+    """
+
+    def __init__(
+        self, count: int, on_reached: Callable[[], None] | None = None
+    ) -> None:
+        self.count = count
+        self.on_reached = on_reached
+        self.accepted = 0
+        self.reserved = 0
+
+    @property
+    def reached(self) -> bool:
+        return self.accepted >= self.count
+
+    @property
+    def missing(self) -> int:
+        """Detail requests still worth scheduling."""
+        return max(0, self.count - self.accepted - self.reserved)
+
+    def reserve(self, wanted: int) -> int:
+        """Reserve up to ``wanted`` detail requests; returns how many to schedule."""
+        granted = min(wanted, self.missing)
+        self.reserved += granted
+        return granted
+
+    def release(self) -> None:
+        """Give back the reservation of a detail request that produced nothing."""
+        self.reserved = max(0, self.reserved - 1)
+
+    def accept(self) -> bool:
+        """Count one more item; False once the target was already reached."""
+        if self.reached:
+            return False
+        self.accepted += 1
+        self.reserved = max(0, self.reserved - 1)
+        if self.reached and self.on_reached is not None:
+            self.on_reached()
+        return True
+
+    @contextmanager
+    def bind(self) -> Iterator["CrawlTarget"]:
+        """Make the target visible to the handlers of crawls run in this context."""
+        token = _current_target.set(self)
+        try:
+            yield self
+        finally:
+            _current_target.reset(token)
+
+
+def crawl_target() -> "CrawlTarget | None":
+    return _current_target.get()
@@ -2,9 +2,11 @@ from __future__ import annotations
 
 import re
 from datetime import datetime
-from typing import Iterable
+from functools import lru_cache
+from html.parser import HTMLParser
+from typing import Iterable, NamedTuple
 
-from bs4 import BeautifulSoup
+from bs4.dammit import EntitySubstitution, UnicodeDammit
 
 
 _DIGIT_PATTERN = re.compile(r"(\d+(?:[.,]\d+)?)\s*(K)?", re.IGNORECASE)
@@ -22,6 +24,46 @@ _Indeed_EDUCATION_PATTERNS: Iterable[tuple[str, str]] = (
     (r"bac\+2|associate", "Associate"),
     (r"doctorat|phd", "Doctorate"),
 )
+
+
+class LevelClassifier:
+    """Single-pass matcher for an ordered list of ``(pattern, label)`` rules.
+
+    Returns the label of the first rule, in list order, that matches anywhere
+    in the text, like trying each pattern with ``re.search`` in turn. All rules
+    are compiled into one alternation ordered by priority. After a hit, the
+    scan resumes just after the hit position with only the rules that rank
+    higher, so the text is read about once whatever the number of rules.
+    """
+
+    def __init__(self, rules: Iterable[tuple[str, str]]) -> None:
+        rules = tuple(rules)
+        self.labels: tuple[str, ...] = tuple(label for _, label in rules)
+        # _prefixes[k] matches rules 0..k-1 only; _prefixes[-1] matches all.
+        groups = [f"(?P<r{i}>{pattern})" for i, (pattern, _) in enumerate(rules)]
+        self._prefixes = [None] + [
+            re.compile("|".join(groups[:k])) for k in range(1, len(groups) + 1)
+        ]
+
+    def classify(self, text: str) -> str | None:
+        best: int | None = None
+        pattern = self._prefixes[-1]
+        pos = 0
+        while pattern is not None:
+            match = pattern.search(text, pos)
+            if match is None:
+                break
+            best = int(match.lastgroup[1:])
+            pattern = self._prefixes[best]
+            pos = match.start() + 1
+        return self.labels[best] if best is not None else None
+
+
+_EXPERIENCE_CLASSIFIER = LevelClassifier(_Indeed_EXPERIENCE_PATTERNS)
+_EDUCATION_CLASSIFIER = LevelClassifier(_Indeed_EDUCATION_PATTERNS)
+# Longer values are free text: none of the structured labels is this long.
+_MAX_LABEL_LENGTH = 64
+
 _Indeed_REQUIREMENT_SECTION_PATTERN = re.compile(
     r"^[ \t]*(?P<section>"
     r"(?:profil|responsabilit[eé]s|missions|requirements?|qualifications?"
@@ -158,12 +200,149 @@ def to_digit(value: str | None) -> int | None:
     return int(number)
 
 
+# Strings inside these tags are not page text (BeautifulSoup skips them too).
+_NON_TEXT_TAGS = frozenset({"script", "style", "template", "rt", "rp"})
+_VOID_TAGS = frozenset(
+    {
+        "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen",
+        "link", "menuitem", "meta", "param", "source", "spacer", "track", "wbr",
+        "basefont", "bgsound", "command", "frame", "image", "isindex", "nextid",
+    }
+)
+_NUMERIC_REF_WITH_DATA = {
+    10: re.compile("^([0-9]+)(.*)"),
+    16: re.compile("^([0-9a-f]+)(.*)"),
+}
+
+
+class _TextExtractor(HTMLParser):
+    """Collect the text strings of an HTML fragment without building a tree.
+
+    Produces the strings ``BeautifulSoup(value, "html.parser").get_text()``
+    would: text between two markup events is one string, comments,
+    declarations and processing instructions are dropped, CDATA is kept and
+    character references are decoded the same way.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=False)
+        self.strings: list[str] = []
+        self._pending: list[str] = []
+        self._open_tags: list[str] = []
+        self._closed_void_tags: list[str] = []
+        self._non_text_depth = 0
+
+    def _end_string(self, keep: bool = True) -> None:
+        if not self._pending:
+            return
+        text = "".join(self._pending).strip()
+        self._pending.clear()
+        if keep and text and not self._non_text_depth:
+            self.strings.append(text)
+
+    def handle_starttag(self, tag, attrs) -> None:
+        self._end_string()
+        if tag in _VOID_TAGS:
+            self._closed_void_tags.append(tag)
+            return
+        self._open_tags.append(tag)
+        if tag in _NON_TEXT_TAGS:
+            self._non_text_depth += 1
+
+    def handle_startendtag(self, tag, attrs) -> None:
+        self._end_string()
+
+    def handle_endtag(self, tag) -> None:
+        if tag in self._closed_void_tags:
+            # A redundant end tag such as the </br> of <br></br>.
+            self._closed_void_tags.remove(tag)
+            return
+        self._end_string()
+        if tag not in self._open_tags:
+            return
+        while self._open_tags:
+            closed = self._open_tags.pop()
+            if closed in _NON_TEXT_TAGS:
+                self._non_text_depth -= 1
+            if closed == tag:
+                break
+
+    def handle_data(self, data) -> None:
+        self._pending.append(data)
+
+    def handle_charref(self, name) -> None:
+        base = 16 if name[:1] in ("x", "X") else 10
+        digits = name[1:] if base == 16 else name
+        extra = ""
+        try:
+            codepoint: int | None = int(digits, base)
+        except ValueError:
+            match = _NUMERIC_REF_WITH_DATA[base].search(digits)
+            codepoint = int(match.group(1), base) if match else None
+            extra = match.group(2) if match else digits
+        if codepoint is not None:
+            self._pending.append(UnicodeDammit.numeric_character_reference(codepoint)[0])
+        if extra:
+            self._pending.append(extra)
+
+    def handle_entityref(self, name) -> None:
+        character = EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name)
+        self._pending.append(character if character is not None else f"&{name}")
+
+    def handle_comment(self, data) -> None:
+        self._end_string()
+
+    def handle_decl(self, decl) -> None:
+        self._end_string()
+
+    def handle_pi(self, data) -> None:
+        self._end_string()
+
+    def unknown_decl(self, data) -> None:
+        self._end_string()
+        if data.upper().startswith("CDATA["):
+            # CDATA stays text even inside the tags skipped above.
+            text = data[len("CDATA["):].strip()
+            if text:
+                self.strings.append(text)
+
+    def close(self) -> None:
+        super().close()
+        self._end_string()
+
+
+def html_to_text(value: str) -> str:
+    """Text of an HTML fragment, one stripped string per line."""
+    if "<" not in value and "&" not in value:
+        return value.strip()
+    parser = _TextExtractor()
+    parser.feed(value)
+    parser.close()
+    return "\n".join(parser.strings)
+
+
+def html_text_sample(value: str, size: int = 500, chunk_size: int = 8192) -> str:
+    """First ``size`` characters of the text of a page, space separated.
+
+    Same as ``soup.get_text(" ", strip=True)[:size]`` but stops tokenizing
+    once enough text has been collected.
+    """
+    parser = _TextExtractor()
+    for start in range(0, len(value), chunk_size):
+        parser.feed(value[start : start + chunk_size])
+        if sum(map(len, parser.strings)) + len(parser.strings) > size:
+            break
+    else:
+        parser.close()
+    return " ".join(parser.strings)[:size]
+
+
 def clean_html(value: str | None) -> str | None:
 
     if not value:
         return None
 
-    text = BeautifulSoup(value, "html.parser").get_text("\n", strip=True)
+    text = html_to_text(value)
     text = re.sub(r"\r", "", text)
     text = re.sub(r"\n{3,}", "\n\n", text)
     normalized = text.strip()
@@ -201,6 +380,13 @@ def normalize_experience_level(value: str | None) -> str | None:
         return None
 
     normalized = value.strip()
+    if len(normalized) > _MAX_LABEL_LENGTH:
+        return _EXPERIENCE_CLASSIFIER.classify(normalized.lower())
+    return _experience_label(normalized)
+
+
+@lru_cache(maxsize=1024)
+def _experience_label(normalized: str) -> str | None:
     if not normalized or normalized.lower() in {"not specified", "non spécifié"}:
         return None
 
@@ -215,11 +401,7 @@ def normalize_experience_level(value: str | None) -> str | None:
     if label_key in {"internship", "apprenticeship", "junior", "mid", "senior", "lead"}:
         return label_key.title()
 
-    for pattern, label in _Indeed_EXPERIENCE_PATTERNS:
-        if re.search(pattern, label_key):
-            return label
-
-    return None
+    return _EXPERIENCE_CLASSIFIER.classify(label_key)
 
 
 def normalize_education_level(value: str | None) -> str | None:
@@ -227,6 +409,13 @@ def normalize_education_level(value: str | None) -> str | None:
         return None
 
     normalized = value.strip()
+    if len(normalized) > _MAX_LABEL_LENGTH:
+        return _EDUCATION_CLASSIFIER.classify(normalized.lower())
+    return _education_label(normalized)
+
+
+@lru_cache(maxsize=1024)
+def _education_label(normalized: str) -> str | None:
     if not normalized or normalized.lower() in {"not specified", "non spécifié"}:
         return None
 
@@ -237,14 +426,44 @@ def normalize_education_level(value: str | None) -> str | None:
     if enum_key in {"associate", "bachelor", "master", "doctorate"}:
         return enum_key.title()
 
-    lower = normalized.lower()
-    for pattern, label in _Indeed_EDUCATION_PATTERNS:
-        if re.search(pattern, lower):
-            return label
-    return None
+    return _EDUCATION_CLASSIFIER.classify(enum_key)
 
 
 _DUTY_HEADERS = frozenset({"responsabilit", "mission"})
+_PARAGRAPH_BREAK = re.compile(r"\n{2,}")
+
+
+class _Line(NamedTuple):
+    paragraph: int
+    text: str  # the line without surrounding whitespace
+    item: str  # the line without surrounding bullets and blanks
+    signal_hits: int  # distinct signal words in the line
+    bullet: bool
+
+
+def _line_features(paragraphs: list[str]) -> list[_Line]:
+    """Non-empty lines of ``paragraphs`` with the features the heuristics use.
+
+    Each line is lowercased and scanned once, so the fallback stages are
+    linear in the text length.
+    """
+    features: list[_Line] = []
+    for index, para in enumerate(paragraphs):
+        for line in para.splitlines():
+            text = line.strip()
+            if not text:
+                continue
+            lower = text.lower()
+            features.append(
+                _Line(
+                    index,
+                    text,
+                    line.strip("-• \t"),
+                    sum(1 for word in _SIGNAL_WORDS if word in lower),
+                    _BULLET_START.match(text) is not None,
+                )
+            )
+    return features
 
 
 def extract_requirements_snippet(text: str | None) -> str | None:
@@ -260,9 +479,10 @@ def extract_requirements_snippet(text: str | None) -> str | None:
         header = section_match.group("section").lower().strip().rstrip(": ")
         if any(header.startswith(dh) for dh in _DUTY_HEADERS):
             continue
-        after = text[section_match.end():]
-        para_break = re.search(r"\n{2,}", after)
-        body = (after[: para_break.start()] if para_break else after).strip()
+        para_break = _PARAGRAPH_BREAK.search(text, section_match.end())
+        body = text[
+            section_match.end() : para_break.start() if para_break else len(text)
+        ].strip()
         if body:
             stop = _STOP_SECTION_PATTERN.search(body)
             if stop:
@@ -280,44 +500,42 @@ def extract_requirements_snippet(text: str | None) -> str | None:
         if body:
             return body[:600]
 
+    # The remaining stages all work off one scan of the lines.
+    paragraphs = _PARAGRAPH_BREAK.split(text)
+    lines = _line_features(paragraphs)
+
     # Stage 1.5: density-scored paragraph (no heading present).
     # Require signal_hits / lines >= 0.4 to reject long company-intro paragraphs
     # that accumulate signal words simply by being large.
+    paragraph_stats: dict[int, list[int]] = {}
+    for line in lines:
+        stats = paragraph_stats.setdefault(line.paragraph, [0, 0, 0])
+        stats[0] += 1
+        stats[1] += line.signal_hits
+        stats[2] += line.bullet
     best_score = 0.0
     best_para: str | None = None
-    for para in re.split(r"\n{2,}", text):
-        para_lines = [l.strip() for l in para.splitlines() if l.strip()]
-        if not para_lines:
-            continue
-        signal_hits = sum(
-            1 for line in para_lines for word in _SIGNAL_WORDS if word in line.lower()
-        )
-        bullet_count = sum(1 for line in para_lines if _BULLET_START.match(line))
+    for index, (line_count, signal_hits, bullet_count) in paragraph_stats.items():
         score = signal_hits + 0.5 * bullet_count
-        density = signal_hits / len(para_lines)
+        density = signal_hits / line_count
         if score > best_score and density >= 0.4:
             best_score = score
-            best_para = para.strip()
+            best_para = paragraphs[index].strip()
     if best_score >= 2 and best_para:
         return best_para[:600]
 
-    lines = [line.strip("-• \t") for line in text.splitlines() if line.strip()]
     bullet_lines = [
-        line
-        for line in lines
-        if len(line) < 400
-        and any(word in line.lower() for word in _SIGNAL_WORDS)
+        line.item for line in lines if len(line.item) < 400 and line.signal_hits
     ]
     if bullet_lines:
         return "; ".join(bullet_lines[:8])
 
     # Stage 3: largest contiguous bullet cluster
-    _BULLET_RE = re.compile(r"^[-•*·]|\d+[.)]\s")
     current: list[str] = []
     best: list[str] = []
     for line in lines:
-        if _BULLET_RE.match(line):
-            current.append(line.lstrip("-•*· ").strip())
+        if _BULLET_START.match(line.item):
+            current.append(line.item.lstrip("-•*· ").strip())
         else:
             if len(current) > len(best):
                 best = current
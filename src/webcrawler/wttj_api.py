@@ -0,0 +1,245 @@
+import asyncio
+import json
+import logging
+import os
+import re
+from collections import deque
+from math import ceil
+from typing import AbstractSet, Any
+from urllib.parse import urlencode
+
+from crawlee.http_clients import HttpClient
+
+from src.webcrawler.parse_pool import parse_pool
+from src.webcrawler.parsers import wttj_job_item
+from src.webcrawler.progress import count_error, count_page
+from src.webcrawler.ratelimit import RateController, rate_controller
+from src.webcrawler.seen import JobKey, SeenJobIndex
+from src.webcrawler.stream import emit
+from src.webcrawler.target import CrawlTarget
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 15
+API_CONCURRENCY = 8
+MAX_ATTEMPTS = 3
+RETRY_DELAY = 0.5
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Public search credentials used by the welcometothejungle.com front end.
+ALGOLIA_APP_ID = os.getenv("WTTJ_ALGOLIA_APP_ID", "CSEKHVMS53")
+ALGOLIA_API_KEY = os.getenv("WTTJ_ALGOLIA_API_KEY", "4bd8f6215d0cc52b26430765769e65a0")
+ALGOLIA_INDEX = os.getenv(
+    "WTTJ_ALGOLIA_INDEX", "wttj_jobs_production_fr_published_at_desc"
+)
+ALGOLIA_URL = os.getenv(
+    "WTTJ_ALGOLIA_URL",
+    f"https://{ALGOLIA_APP_ID.lower()}-dsn.algolia.net/1/indexes/*/queries",
+)
+SITE_URL = os.getenv("WTTJ_SITE_URL", "https://www.welcometothejungle.com")
+JOB_API_URL = os.getenv(
+    "WTTJ_JOB_API_URL",
+    "https://api.welcometothejungle.com/api/v1/organizations/{org}/jobs/{slug}",
+)
+
+_JOB_URL_RE = re.compile(r"companies/([^/]+)/jobs/([^/?#]+)")
+_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/132.0.0.0 Safari/537.36"
+    ),
+    "Accept": "application/json",
+    "Accept-Language": "fr-FR,fr;q=0.9,en-US;q=0.8",
+    "Origin": SITE_URL,
+    "Referer": f"{SITE_URL}/",
+}
+_ALGOLIA_HEADERS = {
+    **_HEADERS,
+    "Content-Type": "application/json",
+    "x-algolia-application-id": ALGOLIA_APP_ID,
+    "x-algolia-api-key": ALGOLIA_API_KEY,
+}
+
+
+class WttjApiError(Exception):
+    pass
+
+
+def job_url(hit: dict[str, Any]) -> str | None:
+    organization = hit.get("organization") or {}
+    if not organization.get("slug") or not hit.get("slug"):
+        return None
+    return f"{SITE_URL}/fr/companies/{organization['slug']}/jobs/{hit['slug']}"
+
+
+def parse_job_url(url: str) -> tuple[str, str]:
+    match = _JOB_URL_RE.search(url)
+    if not match:
+        raise ValueError(f"Could not parse slugs from URL: {url}")
+    return match.group(1), match.group(2)
+
+
+class WttjApi:
+    """JSON client for the WTTJ Algolia search and jobs API."""
+
+    def __init__(
+        self, http_client: HttpClient, controller: RateController = rate_controller
+    ) -> None:
+        self._http_client = http_client
+        self._controller = controller
+
+    async def _request(
+        self,
+        url: str,
+        method: str = "GET",
+        payload: bytes | None = None,
+        headers: dict[str, str] = _HEADERS,
+    ) -> dict[str, Any]:
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            # Blocks pause the host in the controller, so acquire() waits
+            # out the cooldown before a retry.
+            await self._controller.acquire(url)
+            try:
+                response = await self._http_client.send_request(
+                    url, method=method, headers=headers, payload=payload
+                )
+                body = await response.read()
+            except Exception as e:
+                count_error()
+                error = WttjApiError(f"{method} {url} failed: {e}")
+                error.__cause__ = e
+            else:
+                self._controller.record(url, status=response.status_code)
+                if response.status_code < 400:
+                    break
+                count_error()
+                error = WttjApiError(
+                    f"{method} {url} returned HTTP {response.status_code}"
+                )
+                if response.status_code not in RETRY_STATUS_CODES:
+                    raise error
+            if attempt == MAX_ATTEMPTS:
+                raise error
+            logger.info(
+                "Retrying %s %s (%s/%s): %s", method, url, attempt, MAX_ATTEMPTS, error
+            )
+            await asyncio.sleep(RETRY_DELAY * attempt)
+
+        count_page()
+        try:
+            return json.loads(body)
+        except ValueError as e:
+            count_error()
+            raise WttjApiError(f"{method} {url} returned invalid JSON") from e
+
+    async def search(self, query: str, page: int) -> list[dict[str, Any]]:
+        """Return the Algolia hits of the 1-based result ``page``."""
+        params = urlencode({"query": query, "page": page - 1, "hitsPerPage": PAGE_SIZE})
+        payload = {"requests": [{"indexName": ALGOLIA_INDEX, "params": params}]}
+        data = await self._request(
+            ALGOLIA_URL,
+            method="POST",
+            payload=json.dumps(payload).encode("utf-8"),
+            headers=_ALGOLIA_HEADERS,
+        )
+        return (data.get("results") or [{}])[0].get("hits", [])
+
+    async def job(self, org_slug: str, job_slug: str) -> dict[str, Any]:
+        data = await self._request(JOB_API_URL.format(org=org_slug, slug=job_slug))
+        job = data.get("job")
+        if not job:
+            raise WttjApiError(f"Empty job data for {org_slug}/{job_slug}")
+        return job
+
+
+async def crawl_wttj_api(
+    http_client: HttpClient,
+    title: str,
+    location: str | None = None,
+    count: int = 30,
+    known_jobs: AbstractSet[JobKey] | None = None,
+    controller: RateController = rate_controller,
+    concurrency: int = API_CONCURRENCY,
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """Crawl WTTJ through its JSON APIs, without a browser.
+
+    Search pages are requested one at a time, and only while the jobs found
+    so far cannot cover ``count``. At most ``count`` job requests are made
+    unless some fail, in which case the next jobs found take their place.
+    Postings whose key is in ``known_jobs`` are not fetched.
+
+    Returns the crawled items and the job URLs whose detail request failed.
+    Raises ``WttjApiError`` when the first search page fails.
+    """
+    api = WttjApi(http_client, controller)
+    search_query = title if not location else f"{title} {location}"
+    max_pages = ceil(max(1, count) / PAGE_SIZE)
+    target = CrawlTarget(max(1, count))
+    seen = SeenJobIndex(known_jobs or frozenset())
+    search_lock = asyncio.Lock()
+    pending: deque[str] = deque()
+    found: set[str] = set()
+    next_page, searched = 1, 0
+    items: list[dict[str, Any]] = []
+    failed: list[str] = []
+
+    async def next_url() -> str | None:
+        nonlocal next_page, searched
+        async with search_lock:
+            while not pending and next_page <= max_pages:
+                page, next_page = next_page, next_page + 1
+                searched = page
+                try:
+                    hits = await api.search(search_query, page)
+                except WttjApiError as e:
+                    if page == 1:
+                        raise
+                    logger.warning("WTTJ search page %s failed: %s", page, e)
+                    hits = []
+                if not hits:
+                    next_page = max_pages + 1
+                    break
+                urls = [
+                    url
+                    for url in dict.fromkeys(map(job_url, hits))
+                    if url is not None and url not in found
+                ]
+                found.update(urls)
+                pending.extend(seen.claim(urls))
+            return pending.popleft() if pending else None
+
+    async def fetch() -> None:
+        while target.reserve(1):
+            url = await next_url()
+            if url is None:
+                target.release()
+                return
+            try:
+                data = await api.job(*parse_job_url(url))
+                item = await parse_pool.run(wttj_job_item, url, data)
+            except Exception as e:
+                logger.warning("WTTJ job API failed for %s: %s", url, e)
+                failed.append(url)
+                target.release()
+                continue
+            if not target.accept():
+                return
+            # Streamed items are not collected a second time.
+            if not await emit(item):
+                items.append(item)
+
+    workers = [asyncio.ensure_future(fetch()) for _ in range(concurrency)]
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        for worker in workers:
+            worker.cancel()
+    logger.info(
+        "WTTJ search %r: %s jobs from %s search pages, %s found",
+        search_query,
+        target.accepted,
+        searched,
+        len(found),
+    )
+    return items, failed
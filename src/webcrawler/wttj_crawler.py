@@ -1,110 +1,155 @@
 from crawlee.crawlers import PlaywrightCrawlingContext
 from playwright.async_api import Response
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from src.webcrawler.browser import response_watcher, watch_responses
+from src.webcrawler.parse_pool import parse_pool
+from src.webcrawler.parsers import wttj_job_item
 from src.webcrawler.rooter import router
+from src.webcrawler.seen import seen_index
+from src.webcrawler.stream import emit
+from src.webcrawler.target import crawl_target
+from src.webcrawler.wttj_api import JOB_API_URL, SITE_URL, job_url
 from crawlee import Request
+from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 import re
-from src.webcrawler.utils import (
-    clean_html,
-    normalize_date,
-    normalize_education_level,
-    normalize_experience_level,
-)
+
+
+LIST_RESULTS_TIMEOUT = 10.0  # seconds to wait for the Algolia search response
+DOM_FALLBACK_TIMEOUT = 3000  # milliseconds to wait for job links in the DOM
+
+
+def _is_algolia_search(response: Response) -> bool:
+    return (
+        "algolia" in response.url
+        and response.status == 200
+        and response.request.method == "POST"
+    )
+
+
+async def _algolia_hits(response: Response) -> list[dict] | None:
+    data = await response.json()
+    return data.get("results", [{}])[0].get("hits") or None
+
+
+watch_responses("WTTJ_List", _is_algolia_search, _algolia_hits)
+
+
+def _within_target(urls: list) -> list:
+    """The first URLs still needed by the crawl target, if the crawl has one."""
+    target = crawl_target()
+    return urls if target is None else urls[: target.reserve(len(urls))]
+
+
+def _dom_job_urls(hrefs: list) -> list[str]:
+    """Unique absolute job URLs of the job links read from a list page."""
+    job_urls = []
+    for href in hrefs:
+        if not isinstance(href, str):
+            continue
+        if "/companies/" not in href or "/jobs/" not in href:
+            continue
+        full = href if href.startswith("http") else f"{SITE_URL}{href}"
+        job_urls.append(full.split("?")[0].split("#")[0])
+    return list(dict.fromkeys(job_urls))
+
+
+async def _enqueue_next_list_page(context: PlaywrightCrawlingContext) -> None:
+    # List pages are fetched one after the other, only while jobs are missing.
+    user_data = dict(context.request.user_data or {})
+    page = int(user_data.get("page", 1))
+    target = crawl_target()
+    if page >= int(user_data.get("max_pages", 1)) or (target and not target.missing):
+        return
+    parsed = urlparse(context.request.url)
+    query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+    query["page"] = str(page + 1)
+    await context.add_requests(
+        [
+            Request.from_url(
+                urlunparse(parsed._replace(query=urlencode(query))),
+                label="WTTJ_List",
+                headers=context.request.headers,
+                user_data={**user_data, "page": page + 1},
+            )
+        ]
+    )
 
 
 @router.handler(label="WTTJ_List")
 async def wttj_list_handler(context: PlaywrightCrawlingContext):
     context.log.info(f"processing job lists: {context.request.url}")
     queued_count = 0
+    index = seen_index()
 
-    async def extract_url_from_response(response: Response):
-        nonlocal queued_count
-        if (
-            "algolia" in response.url
-            and response.status == 200
-            and response.request.method == "POST"
-        ):
-            try:
-                data = await response.json()
-                hits = data.get("results", [{}])[0].get("hits", [])
-                job_requests = [
-                    Request.from_url(
-                        f"https://www.welcometothejungle.com/fr/companies/"
-                        f"{hit['organization']['slug']}/jobs/{hit['slug']}",
-                        label="WTTJ_Job",
-                    )
-                    for hit in hits
-                    if hit.get("organization") and hit.get("slug")
-                ]
-                if job_requests:
-                    await context.add_requests(job_requests)
-                    queued_count += len(job_requests)
-                    context.log.info(
-                        f"found {len(job_requests)} jobs from current page"
-                    )
-            except Exception as e:
-                context.log.warning(f"failed to extract jobs from response: {e}")
-
-    context.page.on(event="response", f=extract_url_from_response)
-    await context.page.goto(url=context.request.url, wait_until="domcontentloaded")
-    await context.page.wait_for_load_state("networkidle")
-    await context.page.wait_for_timeout(3000)
+    # The page is already navigated; the watcher started listening before that.
+    watcher = response_watcher(context)
+    hits = await watcher.wait(LIST_RESULTS_TIMEOUT) if watcher else None
+    if hits:
+        context.log.info(
+            f"first search results after {watcher.elapsed * 1000:.0f} ms"
+        )
+        job_urls = [url for url in map(job_url, hits) if url is not None]
+        # Count known jobs too so the DOM fallback is not triggered.
+        queued_count += len(job_urls)
+        new_urls = index.filter_new(job_urls) if index else job_urls
+        new_urls = _within_target(new_urls)
+        if index:
+            index.claim(new_urls)
+        if new_urls:
+            await context.add_requests(
+                [Request.from_url(url, label="WTTJ_Job") for url in new_urls]
+            )
+        context.log.info(
+            f"found {len(job_urls)} jobs from current page, queued {len(new_urls)}"
+        )
+    else:
+        context.log.warning(
+            f"no search response within {LIST_RESULTS_TIMEOUT:.0f} s, reading the DOM"
+        )
 
     if queued_count == 0:
+        selector = 'a[href*="/companies/"][href*="/jobs/"]'
+        try:
+            await context.page.wait_for_selector(selector, timeout=DOM_FALLBACK_TIMEOUT)
+        except PlaywrightTimeoutError:
+            context.log.info("no job links rendered on the page")
         hrefs = await context.page.eval_on_selector_all(
-            'a[href*="/companies/"][href*="/jobs/"]',
+            selector,
             "els => els.map(e => e.getAttribute('href')).filter(Boolean)",
         )
-        normalized = []
-        seen = set()
-        for href in hrefs:
-            if not isinstance(href, str):
-                continue
-            if "/companies/" not in href or "/jobs/" not in href:
-                continue
-            full = (
-                href
-                if href.startswith("http")
-                else f"https://www.welcometothejungle.com{href}"
-            )
-            key = full.split("?")[0].split("#")[0]
-            if key in seen:
-                continue
-            seen.add(key)
-            normalized.append(
-                Request.from_url(
-                    key,
-                    label="WTTJ_Job",
-                )
+        job_urls = _dom_job_urls(hrefs)
+        # Count known jobs too, as for the search hits.
+        queued_count += len(job_urls)
+        new_urls = index.filter_new(job_urls) if index else job_urls
+        new_urls = _within_target(new_urls)
+        if index:
+            index.claim(new_urls)
+        if new_urls:
+            await context.add_requests(
+                [Request.from_url(url, label="WTTJ_Job") for url in new_urls]
             )
+            context.log.info(f"fallback enqueued {len(new_urls)} jobs from DOM links")
 
-        if normalized:
-            await context.add_requests(normalized)
-            context.log.info(f"fallback enqueued {len(normalized)} jobs from DOM links")
+    if queued_count:
+        await _enqueue_next_list_page(context)
 
 
 @router.handler(label="WTTJ_Job")
 async def job_handler(context: PlaywrightCrawlingContext):
     url = context.request.url
+    target = crawl_target()
+    if target is not None and target.reached:
+        context.log.info(f"Target of {target.count} jobs reached, skipping {url}")
+        return
     context.log.info(f"Processing job: {url}")
-    await context.page.route(
-        "**/*",
-        lambda route: (
-            route.abort()
-            if route.request.resource_type
-            in ["image", "font", "media", "stylesheet", "other"]
-            else route.continue_()
-        ),
-    )
-
     try:
         match = re.search(r"companies/([^/]+)/jobs/([^/?#]+)", url)
         if not match:
             raise ValueError(f"Could not parse slugs from URL: {url}")
 
         org_slug, job_slug = match.groups()
-        api_url = f"https://api.welcometothejungle.com/api/v1/organizations/{org_slug}/jobs/{job_slug}"
+        api_url = JOB_API_URL.format(org=org_slug, slug=job_slug)
         context.log.info(f"Fetching API directly: {api_url}")
-        await context.page.goto(url, wait_until="commit")
         res_json = await context.page.evaluate(
             f"""
             fetch("{api_url}").then(res => {{
@@ -117,30 +162,13 @@ async def job_handler(context: PlaywrightCrawlingContext):
         data = res_json.get("job", {})
         if not data:
             raise ValueError("API returned empty job data")
-        company = data.get("organization") or {}
-        office = data.get("office") or {}
-        job_desc = clean_html(data.get("description"))
-        job_reqs = clean_html(data.get("profile"))
-        publicated_at = normalize_date(data.get("published_at"))
-        await context.push_data(
-            {
-                "url": url,
-                "platform": "Welcome to the jungle",
-                "title": data.get("name"),
-                "company": company.get("name"),
-                "location": office.get("city"),
-                "contract": data.get("contract_type"),
-                "salary": data.get("salary_min"),
-                "currency": data.get("salary_currency") or "EUR",
-                "exp_level": normalize_experience_level(data.get("experience_level"))
-                or "Not specified",
-                "edu_level": normalize_education_level(data.get("education_level"))
-                or "Not specified",
-                "job_desc": job_desc,
-                "job_reqs": job_reqs,
-                "published_at": publicated_at,
-            }
-        )
+        item = await parse_pool.run(wttj_job_item, url, data)
+        if target is not None and not target.accept():
+            return
+        if not await emit(item):
+            await context.push_data(item)
         context.log.info(f"Successfully saved: {data.get('name')}")
     except Exception as e:
+        if target is not None:
+            target.release()
         context.log.exception("Failed to process WTTJ job %s: %s", url, e)
@@ -0,0 +1,55 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+
+from src.webcrawler.seen import SeenJobIndex, job_keys
+from src.webcrawler.wttj_api import SITE_URL
+from src.webcrawler.wttj_crawler import wttj_list_handler
+
+KNOWN = f"{SITE_URL}/fr/companies/acme/jobs/data-engineer_paris"
+NEW = f"{SITE_URL}/fr/companies/acme/jobs/data-analyst_lyon"
+
+
+class _Page:
+    def __init__(self, hrefs: list[str]) -> None:
+        self.hrefs = hrefs
+
+    async def wait_for_selector(self, selector: str, timeout: float) -> None:
+        pass
+
+    async def eval_on_selector_all(self, selector: str, script: str) -> list[str]:
+        return self.hrefs
+
+
+class _Context:
+    def __init__(self, hrefs: list[str]) -> None:
+        self.request = SimpleNamespace(
+            url=f"{SITE_URL}/fr/jobs?query=data", user_data={"page": 1, "max_pages": 1}
+        )
+        self.page = _Page(hrefs)
+        self.log = logging.getLogger(__name__)
+        self.added = []
+
+    async def add_requests(self, requests) -> None:
+        self.added.extend(requests)
+
+
+def test_dom_fallback_skips_known_jobs():
+    context = _Context(
+        [
+            "/fr/companies/acme/jobs/data-engineer_paris?q=1",
+            "/fr/companies/acme/jobs/data-analyst_lyon",
+            f"{NEW}#apply",
+            "/fr/companies/acme",
+        ]
+    )
+    index = SeenJobIndex(job_keys([KNOWN]))
+
+    async def handle() -> None:
+        with index.bind():
+            await wttj_list_handler(context)
+
+    asyncio.run(handle())
+
+    assert [request.url for request in context.added] == [NEW]
+    assert index.is_known(NEW)